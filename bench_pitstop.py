@@ -0,0 +1,301 @@
+"""End-to-end benchmark of the dashboard views against the fake API.
+
+Every view is driven headlessly (the same code paths as the menus) against
+fake_api.py with the response cache disabled. Wall time is split into
+exclusive per-stage times: HTTP, JSON decode, timezone conversion, rich
+render, and transform (the remainder: filtering, sorting, row building).
+A final pass under tracemalloc records each view's peak memory.
+
+    python bench_pitstop.py                      # save to benchmarks/<timestamp>.json
+    python bench_pitstop.py --compare benchmarks/baseline.json --threshold 0.15
+
+With --compare the exit status is 1 when any view's median got slower than
+the baseline by more than the threshold.
+
+--startup measures cold start instead: `import pitstop` in a fresh
+interpreter under -X importtime (total and the heaviest imports), and the
+wall time of `pitstop.py --help`.
+"""
+import io
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import subprocess
+import statistics
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime
+
+from rich import console, table
+
+import pitstop
+from fake_api import Faults, start_server
+
+STAGES = ("http", "decode", "transform", "timezone", "render")
+
+VIEWS = {
+    "schedule": ["schedule", "--season", "2023", "--tz", "Europe/London", "Asia/Tokyo", "America/New_York"],
+    "standings_drivers": ["standings", "drivers", "--season", "2023"],
+    "standings_teams": ["standings", "teams", "--season", "2023"],
+    "results": ["results", "--season", "2023", "--race", "1"],
+    "fastestlaps": ["fastestlaps", "--season", "2023", "--race", "1"],
+    "grid": ["grid", "--season", "2023", "--race", "1"],
+    "driver": ["driver", "20"],
+    "team": ["team", "1"],
+    "circuit": ["circuit", "1"],
+}
+
+
+class StageClock:
+    """Attributes wall time to the innermost active stage.
+
+    Stages nest (rows are built lazily while the table renders, timezones
+    are converted while rows are built), so entering a stage pauses the
+    one around it and every second is counted exactly once.
+    """
+
+    def __init__(self):
+        self.totals = defaultdict(float)
+        self.stack = ["transform"]
+        self.mark = time.perf_counter()
+
+    def switch(self, push=None):
+        now = time.perf_counter()
+        self.totals[self.stack[-1]] += now - self.mark
+        self.mark = now
+        if push is None:
+            self.stack.pop()
+        else:
+            self.stack.append(push)
+
+    def wrap(self, stage, fn):
+        def timed(*args, **kwargs):
+            self.switch(stage)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.switch()
+        return timed
+
+    def stop(self):
+        self.switch()
+        return dict(self.totals)
+
+
+def patch(target, name, replacement, undo):
+    undo.append((target, name, getattr(target, name)))
+    setattr(target, name, replacement)
+
+
+def run_view(argv, client, clock=None):
+    """Run one headless view with the stage hooks installed; returns its wall time."""
+    undo = []
+    pitstop.parse_utc.cache_clear()
+    pitstop.format_localtime.cache_clear()
+    pitstop.get_zone.cache_clear()
+    try:
+        patch(pitstop, "api", client, undo)
+        patch(pitstop, "console_", console.Console(file=io.StringIO(), width=160), undo)
+        if clock is not None:
+            patch(client.session, "get", clock.wrap("http", client.session.get), undo)
+            patch(pitstop, "decode_response", clock.wrap("decode", pitstop.decode_response), undo)
+            patch(pitstop, "format_localtime", clock.wrap("timezone", pitstop.format_localtime), undo)
+            patch(pitstop, "convert_localtimes", clock.wrap("timezone", pitstop.convert_localtimes), undo)
+            patch(pitstop.console_, "print", clock.wrap("render", pitstop.console_.print), undo)
+        started = time.perf_counter()
+        status = pitstop.run_command(pitstop.parse_args(argv))
+        elapsed = time.perf_counter() - started
+    finally:
+        for target, name, original in reversed(undo):
+            setattr(target, name, original)
+    if status != 0:
+        raise RuntimeError(f"'{' '.join(argv)}' exited with status {status}")
+    return elapsed
+
+
+def bench(url, views, repeat):
+    client = pitstop.APIClient(url, {}, retries=0)
+    results = {}
+    for name, argv in views.items():
+        run_view(argv, client)  # warm up imports, connections and pytz
+        walls, stages = [], defaultdict(list)
+        for _ in range(repeat):
+            clock = StageClock()
+            walls.append(run_view(argv, client, clock))
+            for stage, seconds in clock.stop().items():
+                stages[stage].append(seconds)
+
+        tracemalloc.start()
+        run_view(argv, client)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        results[name] = {
+            "median_ms": statistics.median(walls) * 1000,
+            "min_ms": min(walls) * 1000,
+            "stages_ms": {stage: statistics.median(stages[stage]) * 1000 if stages[stage] else 0.0
+                          for stage in STAGES},
+            "peak_kib": peak / 1024,
+        }
+    client.close()
+    return results
+
+
+PITSTOP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pitstop.py")
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_times(stderr):
+    """Cumulative microseconds of pitstop and of each module it imports directly."""
+    children = {}
+    for line in stderr.splitlines():  # a module's line comes after those of the modules it imports
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        depth, name, micros = len(match[3]), match[4], int(match[2])
+        if depth == 3:
+            children[name] = micros
+        elif depth == 1 and name == "pitstop":
+            return {"pitstop": micros, **children}
+        elif depth == 1:
+            children = {}
+    return {}
+
+
+def startup(repeat):
+    # Compiled bytecode is kept between runs, as it would be for an installed copy.
+    env = {name: value for name, value in os.environ.items() if name != "PYTHONDONTWRITEBYTECODE"}
+    cwd = os.path.dirname(PITSTOP)
+    subprocess.run([sys.executable, "-c", "import pitstop"], cwd=cwd, env=env, check=True)
+
+    imports, helps = defaultdict(list), []
+    for _ in range(repeat):
+        done = subprocess.run([sys.executable, "-X", "importtime", "-c", "import pitstop"],
+                              cwd=cwd, env=env, check=True, capture_output=True, text=True)
+        for name, micros in import_times(done.stderr).items():
+            imports[name].append(micros / 1000)
+        started = time.perf_counter()
+        subprocess.run([sys.executable, PITSTOP, "--help"], cwd=cwd, env=env, check=True, capture_output=True)
+        helps.append(time.perf_counter() - started)
+
+    slowest = sorted((name for name in imports if name != "pitstop"),
+                     key=lambda name: statistics.median(imports[name]), reverse=True)[:10]
+    return {
+        "import_ms": statistics.median(imports["pitstop"]),
+        "help_ms": statistics.median(helps) * 1000,
+        "imports_ms": {name: statistics.median(imports[name]) for name in slowest},
+    }
+
+
+def report_startup(result, baseline=None):
+    table_ = table.Table(title="[yellow]pitstop start-up (ms)", show_lines=True)
+    for header in ("Measure", "Median", *(["vs baseline"] if baseline else [])):
+        table_.add_column(f"[bold white]{header}", justify="right", no_wrap=True)
+    for name, label in (("import_ms", "import pitstop"), ("help_ms", "pitstop.py --help")):
+        row = [label, f"{result[name]:.2f}"]
+        if baseline:
+            row.append(f"{result[name] / baseline[name] - 1:+.1%}")
+        table_.add_row(*row)
+    for name, ms in result["imports_ms"].items():
+        table_.add_row(f"[dim]  {name}", f"{ms:.2f}", *([""] if baseline else []))
+    console.Console().print(table_)
+
+
+def report(results, baseline=None):
+    columns = ["View", "Median", "Min", *STAGES, "Peak KiB"]
+    if baseline:
+        columns.append("vs baseline")
+    table_ = table.Table(title="[yellow]pitstop benchmark (ms)", show_lines=True)
+    for header in columns:
+        table_.add_column(f"[bold white]{header}", justify="right", no_wrap=True)
+    for name, result in results.items():
+        row = [name, f"{result['median_ms']:.2f}", f"{result['min_ms']:.2f}",
+               *(f"{result['stages_ms'][stage]:.2f}" for stage in STAGES), f"{result['peak_kib']:.0f}"]
+        if baseline:
+            before = baseline.get(name)
+            row.append(f"{result['median_ms'] / before['median_ms'] - 1:+.1%}" if before else "new")
+        table_.add_row(*row)
+    console.Console().print(table_)
+
+
+def regressions(results, baseline, threshold):
+    return [name for name, result in results.items()
+            if name in baseline and result["median_ms"] > baseline[name]["median_ms"] * (1 + threshold)]
+
+
+def startup_regressions(result, baseline, threshold):
+    return [name for name in ("import_ms", "help_ms") if result[name] > baseline[name] * (1 + threshold)]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every dashboard view against the fake API.")
+    parser.add_argument("views", nargs="*", choices=[[], *VIEWS], help="views to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per view")
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated API latency in seconds")
+    parser.add_argument("--url", help="benchmark a running API instead of starting fake_api")
+    parser.add_argument("--save", help="where to write the results (default: benchmarks/<timestamp>.json)")
+    parser.add_argument("--compare", help="baseline results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown vs baseline (default 0.10)")
+    parser.add_argument("--startup", action="store_true", help="measure cold start instead of the views")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.startup:
+        return main_startup(args)
+    views = {name: VIEWS[name] for name in args.views} if args.views else VIEWS
+
+    server = None
+    if args.url is None:
+        server = start_server(faults=Faults(latency=args.latency))
+    try:
+        results = bench(args.url or server.url, views, args.repeat)
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["views"]
+    report(results, baseline)
+
+    save(args, {"latency": args.latency, "views": results})
+    return check(regressions(results, baseline, args.threshold) if baseline else [], args.threshold)
+
+
+def main_startup(args):
+    result = startup(args.repeat)
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["startup"]
+    report_startup(result, baseline)
+    save(args, {"startup": result})
+    return check(startup_regressions(result, baseline, args.threshold) if baseline else [], args.threshold)
+
+
+def save(args, results):
+    path = args.save or os.path.join("benchmarks", f"{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"created": datetime.now().isoformat(timespec="seconds"), "python": sys.version.split()[0],
+                   "repeat": args.repeat, **results}, f, indent=2)
+    print(f"Saved {path}", file=sys.stderr)
+
+
+def check(slower, threshold):
+    if slower:
+        print(f"Slower than baseline by more than {threshold:.0%}: {', '.join(slower)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""Local stand-in for the API-Sports Formula 1 API.
+
+Serves the JSON fixtures recorded under fixtures/ (see PITSTOP_RECORD_DIR)
+with optional latency and injected faults, so the dashboard can be run,
+benchmarked and load-tested end to end without a key or network:
+
+    python fake_api.py --port 8080 --latency 0.15 --error-rate 0.05
+    API_URL=http://127.0.0.1:8080 python pitstop.py --fast
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from urllib.parse import urlsplit, parse_qsl
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from pitstop import fixture_path
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+QUOTA_MESSAGE = ("You have reached the request limit for the day, "
+                 "Go to https://dashboard.api-football.com to upgrade your plan.")
+
+
+class Faults:
+    """Latency and failure injection shared by every request of a server.
+
+    Each request independently fails with a 5xx (error_rate), a quota error
+    in a 200 body the way API-Sports reports it (quota_rate), an HTML page
+    in a 200 body like a captive portal or proxy sends (html_rate), a 429
+    with no requests left this minute (limit_rate) or by
+    hanging for hang seconds before answering, long enough to trip the
+    client's read timeout (timeout_rate).
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, quota_rate=0.0, timeout_rate=0.0,
+                 hang=30.0, seed=None, html_rate=0.0, limit_rate=0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.quota_rate = quota_rate
+        self.timeout_rate = timeout_rate
+        self.html_rate = html_rate
+        self.limit_rate = limit_rate
+        self.hang = hang
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def draw(self):
+        """Return (delay in seconds, fault name or None) for the next request."""
+        with self.lock:
+            delay = max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+            roll = self.random.random()
+        for fault, rate in (("error", self.error_rate), ("quota", self.quota_rate), ("timeout", self.timeout_rate),
+                            ("html", self.html_rate), ("limit", self.limit_rate)):
+            if roll < rate:
+                return delay, fault
+            roll -= rate
+        return delay, None
+
+
+def envelope(endpoint, params, response=(), errors=()):
+    return {"get": endpoint, "parameters": params, "errors": errors or [],
+            "results": len(response), "response": list(response)}
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    server_version = "pitstop-fake-api"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        endpoint = url.path.strip("/")
+        params = dict(parse_qsl(url.query))
+        delay, fault = self.server.faults.draw()
+        with self.server.lock:
+            self.server.hits += 1
+            hits = self.server.hits
+
+        self.quota_headers = {}
+        quota = self.server.quota
+        if quota is not None:
+            self.quota_headers = {"x-ratelimit-requests-limit": str(quota),
+                                  "x-ratelimit-requests-remaining": str(max(0, quota - hits))}
+            if hits > quota:
+                fault = fault or "quota"
+
+        time.sleep(delay + (self.server.faults.hang if fault == "timeout" else 0))
+        try:
+            if fault == "error":
+                self.send_body(503, json.dumps({"message": "Service Unavailable"}).encode())
+            elif fault == "limit":
+                self.quota_headers["X-RateLimit-Remaining"] = "0"
+                self.send_body(429, json.dumps({"message": "Too many requests"}).encode())
+            elif fault == "html":
+                self.send_body(200, b"<html><body>Gateway login required</body></html>")
+            elif fault == "quota":
+                self.send_body(200, json.dumps(envelope(endpoint, params, errors={"requests": QUOTA_MESSAGE})).encode())
+            else:
+                self.send_body(200, self.fixture(endpoint, params))
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client gave up waiting, as it should after a hang
+
+    def fixture(self, endpoint, params):
+        path = fixture_path(self.server.root, endpoint, params)
+        if not os.path.isfile(path):
+            # The real API answers unknown ids and seasons with an empty result, not a 404.
+            return json.dumps(envelope(endpoint, params)).encode()
+        with open(path, "rb") as f:
+            return f.read()
+
+    def send_body(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in self.quota_headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class FakeAPIServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, root=FIXTURES_DIR, faults=None, verbose=False, quota=None):
+        super().__init__(address, FixtureHandler)
+        self.root = root
+        self.faults = faults or Faults()
+        self.quota = quota
+        self.verbose = verbose
+        self.lock = threading.Lock()
+        self.hits = 0
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_server(root=FIXTURES_DIR, host="127.0.0.1", port=0, faults=None, verbose=False, quota=None):
+    """Serve fixtures from a background thread; port 0 picks a free port (see server.url)."""
+    server = FakeAPIServer((host, port), root, faults, verbose, quota)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Replay recorded API-Sports fixtures over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help="directory of recorded responses")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random +/- seconds around --latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with a 503")
+    parser.add_argument("--quota-rate", type=float, default=0.0, help="fraction of requests answered with a quota error")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="fraction of requests that hang")
+    parser.add_argument("--html-rate", type=float, default=0.0,
+                        help="fraction of requests answered with an HTML page instead of JSON")
+    parser.add_argument("--limit-rate", type=float, default=0.0,
+                        help="fraction of requests answered with a 429 (per-minute limit reached)")
+    parser.add_argument("--hang", type=float, default=30.0, help="seconds a hanging request waits before answering")
+    parser.add_argument("--quota", type=int,
+                        help="daily request quota: report it in x-ratelimit headers and refuse requests past it")
+    parser.add_argument("--seed", type=int, help="seed the fault injection for reproducible runs")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log every request")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    faults = Faults(args.latency, args.jitter, args.error_rate, args.quota_rate, args.timeout_rate,
+                    args.hang, args.seed, args.html_rate, args.limit_rate)
+    server = FakeAPIServer((args.host, args.port), args.fixtures, faults, args.verbose, args.quota)
+    print(f"Serving {args.fixtures} on {server.url} (API_URL={server.url})", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
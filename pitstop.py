@@ -1,29 +1,747 @@
 import time
-import random
-from datetime import datetime
-import tqdm
-import sys
+started_at = time.perf_counter()  # measured before the imports below
+from datetime import datetime, timezone, timedelta
 import os
-import requests
-from rich import console, table, progress
-import pytz
-from pyfiglet import Figlet
-from dotenv import load_dotenv 
+import sys
+import zlib
+import math
+import itertools
+import argparse
+import threading
+import bisect
+import functools
+import contextlib
+import importlib.util
+import unicodedata
+from operator import attrgetter
+from typing import NamedTuple
+from urllib.parse import urlencode
+
+
+def lazy_import(name):
+    """Return a module that is only really imported on first attribute access.
+
+    requests, rich, pytz, pyfiglet and asyncio take most of the start-up
+    time, yet a test or a cached headless command may never touch them.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    parent, _, child = name.rpartition(".")
+    if parent:  # as the import system does, so 'import concurrent.futures' elsewhere finds it
+        setattr(sys.modules[parent], child, module)
+    loader.exec_module(module)
+    return module
+
+
+json = lazy_import("json")
+csv = lazy_import("csv")
+random = lazy_import("random")
+sqlite3 = lazy_import("sqlite3")
+asyncio = lazy_import("asyncio")
+statistics = lazy_import("statistics")
+difflib = lazy_import("difflib")
+futures = lazy_import("concurrent.futures")
+requests = lazy_import("requests")
+urllib3 = lazy_import("urllib3")
+console = lazy_import("rich.console")
+table = lazy_import("rich.table")
+progress = lazy_import("rich.progress")
+live = lazy_import("rich.live")
+pytz = lazy_import("pytz")
+pyfiglet = lazy_import("pyfiglet")
+
+
+
+def find_env_file(start=os.path.dirname(os.path.abspath(__file__))):
+    """The .env nearest to pitstop.py, looked up the way python-dotenv's find_dotenv does."""
+    path = start
+    while True:
+        candidate = os.path.join(path, ".env")
+        if os.path.isfile(candidate):
+            return candidate
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
 
-load_dotenv()
+
+env_file = find_env_file()
+if env_file:  # python-dotenv (and the re/logging it pulls in) only loads when there is a file to read
+    from dotenv import load_dotenv
+    load_dotenv(env_file)
 
 api_key = os.getenv("API_KEY")
 api_url = os.getenv("API_URL")
 
-payload = {}
 headers = {
     'x-rapidapi-key': api_key,
     'x-rapidapi-host': 'v1.formula-1.api-sports.io'
 }
 
-console_ = console.Console()
-figlet = Figlet()
-figlet.setFont(font='speed')
+
+CATALOG_TTL = 24 * 60 * 60
+CURRENT_TTL = 10 * 60
+CACHE_FOREVER = math.inf
+
+REFRESH_INTERVAL = CURRENT_TTL
+WEEKEND_REFRESH_INTERVAL = 2 * 60
+WATCH_MIN_INTERVAL = 15
+WATCH_MAX_INTERVAL = 5 * 60
+SESSION_LENGTH = timedelta(hours=2)
+
+FIRST_SEASON = 2012
+
+cache_dir = os.path.join(os.getenv("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "pitstop")
+data_dir = os.path.join(os.getenv("XDG_DATA_HOME") or os.path.expanduser("~/.local/share"), "pitstop")
+
+
+def cache_key(endpoint, params):
+    return f"{endpoint}?{urlencode(sorted(params.items()))}"
+
+
+def fixture_path(root, endpoint, params):
+    """Where a response is recorded under root, e.g. root/rankings/races/race=1662.json.
+
+    Shared by the recorder in APIClient and by fake_api.py, which serves
+    the same layout back.
+    """
+    query = urlencode(sorted(params.items()))
+    parts = endpoint.strip("/").split("/")
+    if query:
+        return os.path.join(root, *parts, f"{query}.json")
+    return os.path.join(root, *parts) + ".json"
+
+
+def fields(*names, **nested):
+    return {**dict.fromkeys(names), **nested}
+
+
+NAMED = fields("id", "name")
+RANKING = fields("position", "time", "grid", driver=NAMED, team=NAMED)
+
+# The part of each bulk endpoint's entries the views read; the rest (images,
+# logos, abbreviations, pit counts...) is dropped as soon as a body is decoded.
+# Cached and stored bodies stay complete. Catalog and profile endpoints are
+# shown in full and are not projected.
+SCHEMAS = {
+    "races": fields("id", "season", "type", "date", competition=fields("name"), circuit=fields("name")),
+    "rankings/drivers": fields("position", "points", "wins", driver=NAMED, team=NAMED),
+    "rankings/teams": fields("position", "points", team=NAMED),
+    "rankings/races": RANKING,
+    "rankings/fastestlaps": RANKING,
+    "rankings/startinggrid": RANKING,
+}
+
+
+@functools.cache
+def json_parser():
+    """The fastest JSON parser installed: orjson, then msgspec, then the standard library."""
+    for module, function in (("orjson", "loads"), ("msgspec.json", "decode")):
+        try:
+            return getattr(importlib.import_module(module), function)
+        except ImportError:
+            continue
+    return json.loads
+
+
+def project(value, schema):
+    if schema is None or not isinstance(value, dict):
+        return value
+    return {name: project(value[name], nested) for name, nested in schema.items() if name in value}
+
+
+def decode_response(endpoint, body):
+    """Parse a response body (str or bytes), keeping only SCHEMAS[endpoint] of each entry.
+
+    Raises ValueError whatever the parser when the body is not a JSON object.
+    """
+    try:
+        data = json_parser()(body)
+    except Exception as e:  # json, orjson and msgspec each raise their own decode error
+        raise ValueError(f"response is not JSON: {e}") from e
+    if not isinstance(data, dict):
+        raise ValueError(f"response is a JSON {type(data).__name__}, not an object")
+    schema = SCHEMAS.get(endpoint)
+    entries = data.get('response')
+    if schema is not None and isinstance(entries, list):
+        data['response'] = [project(entry, schema) for entry in entries]
+    return data
+
+
+def cache_ttl(endpoint, params):
+    """Return how long (in seconds) a response may be served from cache.
+
+    Completed seasons never change, the current season changes after every
+    session and the catalogs (timezones, circuits, teams, drivers) change a
+    few times a year.
+    """
+    season = params.get("season")
+    if season is not None:
+        return CACHE_FOREVER if int(season) < datetime.now().year else CURRENT_TTL
+    if endpoint in ("timezone", "circuits", "teams", "drivers"):
+        return CATALOG_TTL
+    return CURRENT_TTL
+
+
+def race_ttl(season):
+    """TTL of a race's rankings, which are keyed by race id so cache_ttl() cannot see their season."""
+    return cache_ttl("races", {"season": season})
+
+
+class ResponseCache:
+    """SQLite store of raw API responses keyed by endpoint and query.
+
+    Entries expire after their TTL and the least recently used ones are
+    evicted once the store grows past max_bytes. Expired entries stay until
+    evicted so they can still be served (stale=True) when the API quota is
+    running out.
+    """
+
+    def __init__(self, path, max_bytes=64 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self._conn = None
+
+    @property
+    def conn(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, body TEXT NOT NULL, size INTEGER NOT NULL, "
+                "expires REAL, accessed REAL NOT NULL)"
+            )
+        return self._conn
+
+    def contains(self, key):
+        with self.lock:
+            row = self.conn.execute("SELECT expires FROM responses WHERE key = ?", (key,)).fetchone()
+        return row is not None and (row[0] is None or row[0] >= time.time())
+
+    def get(self, key, stale=False):
+        body, expired = self.lookup(key)
+        return None if expired and not stale else body
+
+    def lookup(self, key):
+        """Return (body, expired) for a key, (None, False) when absent."""
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute("SELECT body, expires FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None, False
+            body, expires = row
+            self.conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self.conn.commit()
+        return body, expires is not None and expires < now
+
+    def put(self, key, body, ttl):
+        now = time.time()
+        expires = None if ttl == CACHE_FOREVER else now + ttl
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, body, size, expires, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, body, len(body), expires, now),
+            )
+            self._evict()
+            self.conn.commit()
+
+    def _evict(self):
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self.conn.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall():
+            self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        with self.lock:
+            self.conn.execute("DELETE FROM responses")
+            self.conn.commit()
+
+
+class SnapshotStore:
+    """Compressed SQLite copy of every response downloaded by 'pitstop sync'.
+
+    Unlike ResponseCache nothing here expires or gets evicted: it is the
+    only data source in offline mode.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self._conn = None
+
+    @property
+    def conn(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS snapshots ("
+                "key TEXT PRIMARY KEY, body BLOB NOT NULL, fetched REAL NOT NULL)"
+            )
+        return self._conn
+
+    def contains(self, key):
+        with self.lock:
+            return self.conn.execute("SELECT 1 FROM snapshots WHERE key = ?", (key,)).fetchone() is not None
+
+    def get(self, key):
+        with self.lock:
+            row = self.conn.execute("SELECT body FROM snapshots WHERE key = ?", (key,)).fetchone()
+        return None if row is None else zlib.decompress(row[0]).decode()
+
+    def put(self, key, body):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO snapshots (key, body, fetched) VALUES (?, ?, ?)",
+                (key, zlib.compress(body.encode()), time.time()),
+            )
+            self.conn.commit()
+
+
+class RateLimiter:
+    """Token bucket in front of every network request of an APIClient.
+
+    Up to per_minute requests go out back to back, then one every
+    60/per_minute seconds; callers over budget queue in acquire() in
+    arrival order. The remaining counts API-Sports reports in its
+    x-ratelimit headers override the local estimate, so clients sharing
+    one key still back off. Once the daily quota is down to reserve
+    requests, quota_low tells callers to prefer cached data.
+    """
+
+    def __init__(self, per_minute=None, reserve=0):
+        self.lock = threading.Lock()
+        self.per_minute = per_minute or 0
+        self.tokens = float(self.per_minute)
+        self.updated = time.monotonic()
+        self.reserve = reserve
+        self.daily_remaining = None
+        self.daily_date = None
+
+    def configure(self, per_minute):
+        with self.lock:
+            self.per_minute = per_minute or 0
+            self.tokens = min(self.tokens, self.per_minute)
+
+    def acquire(self):
+        with self.lock:
+            if not self.per_minute:
+                return
+            now = time.monotonic()
+            self.tokens = min(self.per_minute, self.tokens + (now - self.updated) * self.per_minute / 60)
+            self.updated = now
+            self.tokens -= 1
+            delay = -self.tokens * 60 / self.per_minute
+        if delay > 0:
+            time.sleep(delay)
+
+    def update(self, headers):
+        """Sync with the quota headers of a response."""
+        minute = headers.get("X-RateLimit-Remaining")
+        daily = headers.get("x-ratelimit-requests-remaining")
+        with self.lock:
+            if minute is not None and self.per_minute:
+                self.tokens = min(self.tokens, int(minute))
+            if daily is not None:
+                self.daily_remaining = int(daily)
+                self.daily_date = datetime.now(timezone.utc).date()
+
+    def exhausted(self):
+        with self.lock:
+            self.daily_remaining = 0
+            self.daily_date = datetime.now(timezone.utc).date()
+
+    @property
+    def quota_low(self):
+        # API-Sports quotas reset at 00:00 UTC; a count from an earlier day no longer applies.
+        return (self.daily_remaining is not None and self.daily_remaining <= self.reserve
+                and self.daily_date == datetime.now(timezone.utc).date())
+
+
+class SingleFlight:
+    """Collapses concurrent calls for the same key into one.
+
+    The first caller runs fn; everyone arriving while it is in flight waits
+    and gets the same result (or exception). Nothing is kept afterwards.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.flights = {}
+
+    def do(self, key, fn):
+        """Return (result, shared) where shared is True for callers that waited."""
+        with self.lock:
+            flight = self.flights.get(key)
+            if flight is None:
+                flight = self.flights[key] = futures.Future()
+                leader = True
+            else:
+                leader = False
+        if not leader:
+            return flight.result(), True
+
+        try:
+            result = fn()
+            flight.set_result(result)
+            return result, False
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                del self.flights[key]
+
+
+class Profiler:
+    """Opt-in timing of API calls and views, enabled by --profile.
+
+    Every API call is recorded with its endpoint, status, size, latency and
+    where it was served from. Every view's wall time is split into fetch,
+    transform, render and wait (prompts and cosmetic pauses); stages nest,
+    so each second is counted once, in the innermost stage. When disabled a
+    stage costs one attribute check.
+    """
+
+    STAGES = ("fetch", "transform", "render", "wait")
+
+    def __init__(self):
+        self.enabled = False
+        self.origin = time.perf_counter()
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.calls = []
+        self.views = []
+        self.events = []
+
+    @contextlib.contextmanager
+    def view(self, name):
+        if not self.enabled or getattr(self.local, "view", None) is not None:
+            yield
+            return
+        start = time.perf_counter()
+        self.local.view = {"name": name, **dict.fromkeys(self.STAGES, 0.0)}
+        self.local.stack = ["transform"]
+        self.local.mark = start
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self._switch(end)
+            view, self.local.view = self.local.view, None
+            view["total"] = end - start
+            with self.lock:
+                self.views.append(view)
+                self.events.append(self._event(name, "view", start, end, {}))
+
+    @contextlib.contextmanager
+    def stage(self, name, **details):
+        """Time a block as one stage; the yielded dict is added to its trace event."""
+        if not self.enabled:
+            yield details
+            return
+        start = time.perf_counter()
+        in_view = getattr(self.local, "view", None) is not None
+        if in_view:
+            self._switch(start, push=name)
+        try:
+            yield details
+        except BaseException as e:
+            details.setdefault("error", type(e).__name__)
+            response = getattr(e, "response", None)
+            if response is not None:
+                details.setdefault("status", response.status_code)
+            raise
+        finally:
+            end = time.perf_counter()
+            if in_view:
+                self._switch(end)
+            with self.lock:
+                if "endpoint" in details:
+                    self.calls.append({**details, "seconds": end - start})
+                self.events.append(self._event(details.get("key", name), name, start, end, details))
+
+    def _switch(self, now, push=None):
+        stack = self.local.stack
+        self.local.view[stack[-1]] += now - self.local.mark
+        self.local.mark = now
+        if push is None:
+            stack.pop()
+        else:
+            stack.append(push)
+
+    def _event(self, name, category, start, end, details):
+        return {"name": name, "cat": category, "ph": "X", "pid": os.getpid(), "tid": threading.get_ident(),
+                "ts": (start - self.origin) * 1e6, "dur": (end - start) * 1e6, "args": dict(details)}
+
+    def report(self, out):
+        """Print per-endpoint and per-view summary tables."""
+        by_endpoint = {}
+        for call in self.calls:
+            by_endpoint.setdefault(call.get("endpoint", "?"), []).append(call)
+        calls_table = table.Table(title="[yellow]API calls", show_lines=True)
+        for header in ("Endpoint", "Calls", "Cache hits", "Shared", "Network", "Errors", "KiB", "Mean ms", "Max ms"):
+            calls_table.add_column(f"[bold white]{header}", justify="right", no_wrap=True)
+        for endpoint, calls in sorted(by_endpoint.items()):
+            seconds = [call["seconds"] for call in calls]
+            calls_table.add_row(
+                endpoint, str(len(calls)),
+                str(sum(call.get("source") in ("cache", "store", "stale") for call in calls)),
+                str(sum(call.get("source") == "shared" for call in calls)),
+                str(sum(call.get("source") == "network" for call in calls)),
+                str(sum("error" in call for call in calls)),
+                f"{sum(call.get('bytes', 0) for call in calls) / 1024:.1f}",
+                f"{statistics.fmean(seconds) * 1000:.1f}", f"{max(seconds) * 1000:.1f}",
+            )
+
+        by_view = {}
+        for view in self.views:
+            by_view.setdefault(view["name"], []).append(view)
+        views_table = table.Table(title="[yellow]Views (mean ms)", show_lines=True)
+        for header in ("View", "Runs", "Total", *(stage.title() for stage in self.STAGES)):
+            views_table.add_column(f"[bold white]{header}", justify="right", no_wrap=True)
+        for name, views in by_view.items():
+            views_table.add_row(name, str(len(views)), *(
+                f"{statistics.fmean(view[column] for view in views) * 1000:.1f}"
+                for column in ("total", *self.STAGES)))
+
+        out.print(calls_table)
+        out.print(views_table)
+
+    def dump(self, path):
+        """Write every recorded span as a Chrome trace (chrome://tracing, Perfetto)."""
+        with self.lock:
+            events = list(self.events)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+profiler = Profiler()
+
+
+class APIClient:
+    """Shared client for the API-Sports endpoints.
+
+    Owns a single pooled requests.Session so every menu action reuses an
+    open keep-alive connection instead of paying a new TCP+TLS handshake.
+    Successful responses are kept in the on-disk cache; set refresh to
+    always go to the network (fresh copies are still written back). With
+    offline set, responses come only from the snapshot store and no network
+    I/O happens at all. With record_dir set, every downloaded response is
+    also written there as a fixture that fake_api.py can replay.
+
+    Identical requests in flight at the same time (several views, users or
+    prefetch workers asking for one URL) share a single download. Network
+    requests pass through the limiter. While the daily quota is low,
+    or once it has run out, expired cached copies are served rather than
+    spending (or failing) a request. Keys watched by a running revalidator
+    (see Refresher) are also served stale and refreshed in the background.
+    """
+
+    def __init__(self, base_url, headers, pool_size=4, timeout=(3.05, 10), retries=3, backoff=0.5,
+                 cache=None, store=None, record_dir=None, limiter=None):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.cache = cache
+        self.store = store
+        self.record_dir = record_dir
+        self.limiter = limiter or RateLimiter()
+        self.flights = SingleFlight()
+        self.revalidator = None
+        self.refresh = False
+        self.offline = False
+        self.headers = headers
+        self.pool_size = pool_size
+        self.retries = retries
+        self.backoff = backoff
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        """The pooled session, set up on first use (requests is only imported then)."""
+        with self._session_lock:
+            if self._session is None:
+                # 429s are retried by _download instead, so every attempt waits for the limiter, and the
+                # last 5xx is returned rather than raised so _download still reads its quota headers.
+                retry = urllib3.util.Retry(total=self.retries, backoff_factor=self.backoff, raise_on_status=False,
+                                           status_forcelist=(500, 502, 503, 504), allowed_methods=frozenset(["GET"]))
+                adapter = requests.adapters.HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size,
+                                                        max_retries=retry)
+                session = requests.Session()
+                session.headers.update(self.headers)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session = session
+            return self._session
+
+    def cached(self, endpoint, **params):
+        return self.cache is not None and not self.refresh and self.cache.contains(cache_key(endpoint, params))
+
+    def stored(self, endpoint, **params):
+        return self.store is not None and self.store.contains(cache_key(endpoint, params))
+
+    def get(self, endpoint, ttl=None, **params):
+        """GET an endpoint; ttl overrides the cache_ttl() policy for this response."""
+        key = cache_key(endpoint, params)
+        with profiler.stage("fetch", endpoint=endpoint, key=key) as call:
+            if self.offline:
+                body = self.store.get(key) if self.store is not None else None
+                if body is None:
+                    raise requests.exceptions.RequestException(f"{key} is not in the offline store, run 'pitstop sync' first")
+                call.update(source="store", bytes=len(body))
+                return decode_response(endpoint, body)
+
+            if self.cache is not None and not self.refresh:
+                body, expired = self.cache.lookup(key)
+                if (body is not None and expired and self.revalidator is not None
+                        and self.revalidator.is_alive() and self.revalidator.watches(key)):
+                    self.revalidator.kick()
+                    expired = False
+                if body is not None and (not expired or self.limiter.quota_low):
+                    call.update(source="stale" if expired else "cache", bytes=len(body))
+                    return decode_response(endpoint, body)
+
+            try:
+                (data, response), shared = self.flights.do(key, lambda: self._download(endpoint, key, params, ttl))
+            except requests.exceptions.RequestException:
+                # Out of quota (or failing while it is low): the last copy beats an error.
+                body = self.cache.get(key, stale=True) if self.cache is not None and self.limiter.quota_low else None
+                if body is None:
+                    raise
+                call.update(source="stale", bytes=len(body))
+                return decode_response(endpoint, body)
+            call.update(source="shared" if shared else "network", status=response.status_code,
+                        bytes=len(response.content))
+            return data
+
+    def revalidate(self, endpoint, **params):
+        """Download a fresh copy into the cache, however new the cached one is."""
+        key = cache_key(endpoint, params)
+        with profiler.stage("fetch", endpoint=endpoint, key=key) as call:
+            (data, response), shared = self.flights.do(key, lambda: self._download(endpoint, key, params, None))
+            call.update(source="shared" if shared else "network", status=response.status_code,
+                        bytes=len(response.content))
+        return data
+
+    def snapshot(self, endpoint, ttl=None, **params):
+        """Copy one response into the snapshot store (from the cache when fresh) and return it."""
+        key = cache_key(endpoint, params)
+        body = self.cache.get(key) if self.cache is not None and not self.refresh else None
+        if body is None:
+            (data, response), _ = self.flights.do(key, lambda: self._download(endpoint, key, params, ttl))
+            body = response.text
+        else:
+            data = decode_response(endpoint, body)
+        self.store.put(key, body)
+        return data
+
+    def _download(self, endpoint, key, params, ttl):
+        url = f"{self.base_url}/{endpoint}"
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(self.backoff * 2 ** attempt)
+            self.limiter.acquire()
+            response = self.session.get(url, params=params or None, timeout=self.timeout)
+            self.limiter.update(response.headers)  # the quota headers matter most on a 429 or 5xx
+            if response.status_code != 429:
+                break
+        response.raise_for_status()
+
+        try:
+            data = decode_response(endpoint, response.content)
+        except ValueError as e:  # e.g. a proxy's HTML error page
+            raise requests.exceptions.InvalidJSONError(str(e), response=response) from e
+        errors = data.get('errors')
+        if errors:
+            # API-Sports reports bad keys, parameters and quota in a 200 body; never keep those as data.
+            if isinstance(errors, dict) and 'requests' in errors:
+                self.limiter.exhausted()
+            messages = errors.values() if isinstance(errors, dict) else errors
+            raise requests.exceptions.RequestException("; ".join(map(str, messages)))
+
+        if self.cache is not None:
+            self.cache.put(key, response.text, cache_ttl(endpoint, params) if ttl is None else ttl)
+        if self.record_dir:
+            self._record(endpoint, params, response.text)
+
+        return data, response
+
+    def _record(self, endpoint, params, body):
+        path = fixture_path(self.record_dir, endpoint, params)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(body)
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+
+
+api = APIClient(
+    api_url,
+    headers,
+    pool_size=int(os.getenv("PITSTOP_POOL_SIZE", 4)),
+    timeout=(3.05, float(os.getenv("PITSTOP_TIMEOUT", 10))),
+    retries=int(os.getenv("PITSTOP_RETRIES", 3)),
+    cache=ResponseCache(
+        os.path.join(cache_dir, "responses.sqlite3"),
+        max_bytes=int(os.getenv("PITSTOP_CACHE_MAX_MB", 64)) * 1024 * 1024,
+    ),
+    store=SnapshotStore(os.path.join(data_dir, "snapshots.sqlite3")),
+    record_dir=os.getenv("PITSTOP_RECORD_DIR"),
+    limiter=RateLimiter(int(os.getenv("PITSTOP_RATE_LIMIT", 10)), reserve=int(os.getenv("PITSTOP_QUOTA_RESERVE", 5))),
+)
+
+fast_mode = os.getenv("PITSTOP_FAST", "").lower() in ("1", "true", "yes")
+background_refresh = os.getenv("PITSTOP_BACKGROUND_REFRESH", "1").lower() in ("1", "true", "yes")
+first_screen_at = None
+
+class LazyConsole:
+    """A rich Console created on first use, so importing pitstop doesn't import rich."""
+
+    def __init__(self, **options):
+        self._options = options
+        self._console = None
+
+    def __getattr__(self, name):
+        if self._console is None:
+            self._console = console.Console(**self._options)
+        return getattr(self._console, name)
+
+    def __enter__(self):  # rich's Live and Progress hold the console with a with statement
+        return self.__getattr__("__enter__")()
+
+    def __exit__(self, *exc_info):
+        return self.__getattr__("__exit__")(*exc_info)
+
+
+console_ = LazyConsole()
+error_console = LazyConsole(stderr=True)
+
+def pause(seconds):
+    """Cosmetic delay between screens; skipped entirely in fast mode."""
+    if not fast_mode:
+        with profiler.stage("wait"):
+            time.sleep(seconds)
+
+
+@profiler.stage("wait")
+def ask(message):
+    """Prompt for a line of input; the time spent waiting is not charged to the view."""
+    return console_.input(message)
 
 def clear_screen():
     if os.name == 'nt':  
@@ -32,23 +750,203 @@ def clear_screen():
         os.system('clear')
 
 
-def main():
-    clear_screen()
-    console_.print("[bold magenta]🟢 🟡 🔴 Welcome to [/bold magenta]")
-    console_.print(figlet.renderText("Pitstop!"))
-    time.sleep(6)
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="pitstop", description="F1 race stats dashboard")
+    parser.add_argument("--refresh", action="store_true",
+                        help="ignore cached API responses and fetch everything again")
+    parser.add_argument("--fast", action="store_true", default=fast_mode,
+                        help="skip the banner, loading bar and all cosmetic delays (or set PITSTOP_FAST=1)")
+    parser.add_argument("--offline", action="store_true",
+                        default=os.getenv("PITSTOP_OFFLINE", "").lower() in ("1", "true", "yes"),
+                        help="read only from the local snapshot store, no network (or set PITSTOP_OFFLINE=1)")
+    parser.add_argument("--profile", action="store_true",
+                        help="time every API call and view and print a summary on exit")
+    parser.add_argument("--profile-trace", metavar="FILE",
+                        help="also write the timings as a Chrome trace (implies --profile)")
+
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND",
+                                     help="run a single view without the menus (omit for the interactive dashboard)")
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument("--format", choices=OUTPUT_FORMATS, default="table",
+                        help="rich table (default) or rows streamed as json, ndjson or csv")
+
+    schedule = commands.add_parser("schedule", parents=[output], help="upcoming and past sessions of a season")
+    schedule.add_argument("--season", type=season_arg, default=datetime.now().year)
+    schedule.add_argument("--tz", type=tz_arg, nargs="+", default=["UTC"],
+                          help="one or more timezones such as Europe/London, one Date/Time column each (default UTC)")
+
+    countdown = commands.add_parser("countdown", parents=[output], help="time left to the remaining races of this season")
+    countdown.add_argument("--tz", type=tz_arg, default="UTC", help="timezone such as Europe/London (default UTC)")
+
+    standings = commands.add_parser("standings", parents=[output], help="drivers' or teams' championship standings")
+    standings.add_argument("kind", choices=["drivers", "teams"])
+    standings.add_argument("--season", type=season_arg, default=datetime.now().year)
+
+    for name, description in (("results", "race results"), ("fastestlaps", "fastest laps"), ("grid", "starting grid")):
+        ranking = commands.add_parser(name, parents=[output], help=f"{description} of a completed race")
+        ranking.add_argument("--season", type=season_arg, default=datetime.now().year)
+        ranking.add_argument("--race", type=int, default=-1,
+                             help="round among the season's completed races, as listed in the menu (default latest)")
+
+    weekend = commands.add_parser("weekend", parents=[output],
+                                  help="results, fastest laps and starting grid of a completed race at once")
+    weekend.add_argument("--season", type=season_arg, default=datetime.now().year)
+    weekend.add_argument("--race", type=int, default=-1,
+                         help="round among the season's completed races, as listed in the menu (default latest)")
+
+    watch_ = commands.add_parser("watch", help="keep a race's results, fastest laps and grid on screen as they change")
+    watch_.add_argument("--season", type=season_arg, default=datetime.now().year)
+    watch_.add_argument("--race", type=int,
+                        help="round among the season's completed races (default the race of this weekend, or the latest)")
+    watch_.add_argument("--min-interval", type=int, default=WATCH_MIN_INTERVAL,
+                        help=f"seconds between polls after a change (default {WATCH_MIN_INTERVAL})")
+    watch_.add_argument("--max-interval", type=int, default=WATCH_MAX_INTERVAL,
+                        help=f"longest wait between polls when nothing changes (default {WATCH_MAX_INTERVAL})")
+
+    driver = commands.add_parser("driver", parents=[output], help="driver profile")
+    driver.add_argument("name", nargs="+", help="API-Sports driver id, or a name such as hamilton")
+
+    career = commands.add_parser("career", parents=[output], help="a driver's team and standing in every season")
+    career.add_argument("name", nargs="+", help="API-Sports driver id, or a name such as hamilton")
+
+    circuit = commands.add_parser("circuit", parents=[output], help="list circuits, or show one circuit's details")
+    circuit.add_argument("name", nargs="*", help="API-Sports circuit id, or a name such as monza")
+
+    search = commands.add_parser("search", parents=[output], help="find drivers, teams and circuits by name")
+    search.add_argument("name", nargs="*", help="id, start of a name, or a misspelled name")
+    search.add_argument("--kind", choices=["driver", "team", "circuit"], help="only search this kind")
+    search.add_argument("--reindex", action="store_true", help="rebuild the index from local data first")
+
+    prefetch = commands.add_parser("prefetch", help="download every race ranking of a season into the local cache")
+    prefetch.add_argument("--season", type=season_arg, default=datetime.now().year)
+    prefetch.add_argument("--workers", type=int, default=4, help="concurrent requests (default 4)")
+    prefetch.add_argument("--rate", type=int, default=int(os.getenv("PITSTOP_RATE_LIMIT", 10)),
+                          help="max requests per minute, 0 for no limit (default PITSTOP_RATE_LIMIT or 10)")
+
+    sync_ = commands.add_parser("sync", help="download seasons, catalogs and race rankings for --offline use")
+    sync_.add_argument("--season", type=season_arg, nargs="+", default=[datetime.now().year],
+                       help="seasons to download (default current)")
+    sync_.add_argument("--all", action="store_true", help=f"download every season from {FIRST_SEASON}")
+    sync_.add_argument("--workers", type=int, default=4, help="concurrent requests (default 4)")
+    sync_.add_argument("--rate", type=int, default=int(os.getenv("PITSTOP_RATE_LIMIT", 10)),
+                       help="max requests per minute, 0 for no limit (default PITSTOP_RATE_LIMIT or 10)")
+
+    history = commands.add_parser("history", help="download races and standings of many seasons for offline analytics")
+    history.add_argument("--season", type=season_arg, nargs="+",
+                         help=f"seasons to download (default every season from {FIRST_SEASON})")
+    history.add_argument("--workers", type=int, default=4, help="concurrent requests (default 4)")
+    history.add_argument("--rate", type=int, default=int(os.getenv("PITSTOP_RATE_LIMIT", 10)),
+                         help="max requests per minute, 0 for no limit (default PITSTOP_RATE_LIMIT or 10)")
+
+    stats = commands.add_parser("stats", parents=[output], help="cross-season statistics from locally stored results")
+    stats.add_argument("query", choices=["build", "average-finish", "grid-delta", "fastest-laps", "points"],
+                       help="'build' re-indexes the stored results; the others query them")
+    stats.add_argument("--season", type=season_arg, nargs="+",
+                       help="restrict the query to these seasons (default all); 'build' always indexes every season")
+    stats.add_argument("--driver", type=int, help="API-Sports driver id (points)")
+
+    team = commands.add_parser("team", parents=[output], help="list teams, or show one team's details")
+    team.add_argument("name", nargs="*", help="API-Sports team id, or a name such as ferrari")
+
+    return parser.parse_args(argv)
+
+
+def season_arg(value):
+    season = int(value)
+    if not valid_season(season):
+        raise argparse.ArgumentTypeError(f"no data available for {season} (seasons {FIRST_SEASON} onwards)")
+    return season
+
+
+def tz_arg(value):
+    try:
+        get_zone(value)
+    except pytz.UnknownTimeZoneError:
+        raise argparse.ArgumentTypeError(f"unknown timezone '{value}'") from None
+    return value
 
-    with progress.Progress() as progress_:
-        task = progress_.add_task("[cyan]Loading...", total=100)
-        while not progress_.finished:
-            progress_.update(task, advance=random.randint(1,5))
-            time.sleep(random.uniform(0.1, 0.3))
 
-    console_.print("[bold green]The application is ready![/bold green]")
-    time.sleep(2)
-    menu()
+def main(argv=None):
+    global fast_mode
+    args = parse_args(argv)
+    api.refresh = args.refresh
+    api.offline = args.offline
+    fast_mode = args.fast
+    profiler.enabled = args.profile or args.profile_trace is not None
+
+    try:
+        if args.command:
+            fast_mode = True
+            with profiler.view(args.command):
+                return run_command(args)
+        start_dashboard()
+    except BrokenPipeError:
+        # The reader went away (e.g. piped into head); send the rest of stdout, and its flush at exit, nowhere.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    finally:
+        if profiler.enabled:
+            profiler.report(error_console)
+            if args.profile_trace:
+                profiler.dump(args.profile_trace)
+                error_console.print(f"[dim]Trace written to {args.profile_trace}[/dim]")
+
+
+def start_dashboard():
+    if not fast_mode:
+        clear_screen()
+        console_.print("[bold magenta]🟢 🟡 🔴 Welcome to [/bold magenta]")
+        console_.print(pyfiglet.Figlet(font='speed').renderText("Pitstop!"))
+        pause(6)
+
+        with progress.Progress() as progress_:
+            task = progress_.add_task("[cyan]Loading...", total=100)
+            while not progress_.finished:
+                progress_.update(task, advance=random.randint(1,5))
+                time.sleep(random.uniform(0.1, 0.3))
+
+        console_.print("[bold green]The application is ready![/bold green]")
+        pause(2)
+
+    refresher = None
+    if not api.offline and background_refresh:
+        refresher = api.revalidator = Refresher(api)
+        refresher.start()
+    try:
+        run()
+    finally:
+        if refresher is not None:
+            refresher.stop()
+            api.revalidator = None
+
+def run(state="menu"):
+    """Drive the dashboard as a loop over screens.
+
+    Every screen returns the name of the next one instead of calling it, so
+    the stack (and every response a screen fetched) is released between
+    screens and a session can run indefinitely.
+    """
+    screens = {
+        "menu": menu,
+        "schedule": race_schedule,
+        "statistics": race_statistics,
+        "queries": general_queries,
+    }
+    while state != "exit":
+        with profiler.view(state):
+            try:
+                state = screens[state]()
+            except ValueError:  # a typo in any screen's prompt goes back to the menu
+                console_.print("[bold red]Please enter a valid option number.[/bold red]")
+                pause(2)
+                state = "menu"
+
+    with console_.status("[bold green]Exiting...", spinner="dots3"):
+        pause(3)
+        clear_screen()
 
 def menu():
+    global first_screen_at
     clear_screen()
     try:
         table_ = table.Table(title="\n[yellow]Main Menu")
@@ -62,71 +960,90 @@ def menu():
 
         console_.print(table_)
 
-        choice = int(input("Input your choice: ").strip())
+        if first_screen_at is None:
+            first_screen_at = time.perf_counter()
+            if fast_mode:
+                console_.print(f"[dim]First screen in {(first_screen_at - started_at) * 1000:.0f} ms[/dim]")
+
+        choice = int(ask("Input your choice: ").strip())
 
         match choice:
             case 1:
-                race_schedule()
+                return "schedule"
             case 2:
-                race_statistics()
+                return "statistics"
             case 3:
-                general_queries()
+                return "queries"
             case 4:
-                with console_.status("[bold green]Exiting...", spinner="dots3"):
-                    time.sleep(3)
-                    clear_screen()
-                sys.exit()
+                return "exit"
             case _:
                 console_.log("[bold red]Invalid option selected! Please choose a valid option.[/bold red]")
-                time.sleep(2)
-                menu()
+                pause(2)
+                return "menu"
     except ValueError:
         console_.print("[bold red]Please enter a valid option number.[/bold red]")
-        time.sleep(2)
-        menu()
+        pause(2)
+        return "menu"
 
 def sub_menu():
     while True:
         try:
-            opt = int(console_.input("[bold cyan]Select:[/bold cyan]\n[bold green]1.Return to Menu[/bold green]\t\t[bold red]2.Exit[/bold red]\n"))
+            opt = int(ask("[bold cyan]Select:[/bold cyan]\n[bold green]1.Return to Menu[/bold green]\t\t[bold red]2.Exit[/bold red]\n"))
 
             if opt == 1:
                 with console_.status(f"[italic cyan]Returning to Menu [/italic cyan]", spinner="dots3"):
-                    time.sleep(3)
-                menu()
-                break
+                    pause(3)
+                return "menu"
             elif opt == 2:
-                with console_.status("[bold green]Exiting...", spinner="dots3"):
-                    time.sleep(3)
-                    clear_screen()
-                sys.exit()
+                return "exit"
             else:
                 console_.print("[bold red]Invalid input! Please enter 1 or 2.[/bold red]")
-                time.sleep(2)
+                pause(2)
         except ValueError:
             console_.print("[bold red]Please enter a valid option number.[/bold red]")
-            time.sleep(2)
+            pause(2)
 
 def conversion_to_localtime(utc_time, user_timezone):
-    utc_time = datetime.fromisoformat(utc_time.replace("Z", "+00:00"))
-    local_zone = pytz.timezone(user_timezone)
-    local_dt = utc_time.astimezone(local_zone)
+    return format_localtime(parse_utc(utc_time), user_timezone)
+
+@functools.lru_cache(maxsize=4096)
+def parse_utc(utc_time):
+    return datetime.fromisoformat(utc_time.replace("Z", "+00:00"))
+
+@functools.lru_cache(maxsize=None)
+def get_zone(user_timezone):
+    return pytz.timezone(user_timezone)
+
+@functools.lru_cache(maxsize=8192)
+def format_localtime(utc_dt, user_timezone):
+    local_dt = utc_dt.astimezone(get_zone(user_timezone))
     return local_dt.strftime("%d-%m-%Y %H:%M")
 
-def fetch_timezones():
-    url = f"{api_url}/timezone"
-    headers = {
-        'x-rapidapi-key': 'c13e1dd3151559298a27890618f515d9',
-        'x-rapidapi-host': 'v1.formula-1.api-sports.io'
-    }
+def convert_localtimes(utc_times, user_timezone):
+    """Convert a whole column of UTC datetimes (or ISO strings) to one zone.
 
-    try:
-        response = requests.request("GET", url, headers=headers)
-        response.raise_for_status()
+    Zone objects are cached and every (timestamp, zone) pair is memoized,
+    so re-rendering a schedule, or the same season in ten zones, costs
+    dictionary lookups rather than tz arithmetic and strftime per row.
+    """
+    return [format_localtime(parse_utc(utc_time) if isinstance(utc_time, str) else utc_time, user_timezone)
+            for utc_time in utc_times]
 
-        data = response.json()
-        if data.get('errors') and 'requests' in data['errors']:
-                    raise requests.exceptions.RequestException
+_timezone_index = None
+
+def fetch_timezones(refresh=False):
+    """Return the continent -> cities index, built once per process.
+
+    The raw /timezone response is persisted by the response cache, so after
+    the first run even building the index costs no API call. Re-prompts
+    after a mistyped continent or city are served from memory.
+    """
+    global _timezone_index
+    if _timezone_index is not None and not refresh:
+        return _timezone_index
+
+    try:
+        data = api.get("timezone")
 
         timezones = data.get('response', [])
 
@@ -137,546 +1054,1334 @@ def fetch_timezones():
                 structured_timezones[continent] = []
             structured_timezones[continent].append(city)
 
+        _timezone_index = structured_timezones
         return structured_timezones
 
     except requests.exceptions.RequestException as e:
         console_.print(f"[bold red]Error fetching timezones...⛓️‍💥[/bold red]")
-        time.sleep(2)
-        sub_menu()
+        pause(2)
 
 
-def fetch_races(season, selected_index = None):
-    url = f"{api_url}/races?season={season}"
+def invalidate_timezones():
+    global _timezone_index
+    _timezone_index = None
 
-    try:
-        race_id = None
-        race_name = None
-        response = requests.request(
-            "GET", url, headers=headers, data=payload)
-        response.raise_for_status()
 
-        data = response.json()
-        if data.get('errors') and 'requests' in data['errors']:
-            raise requests.exceptions.RequestException()
+def valid_season(season):
+    return FIRST_SEASON <= season <= datetime.now().year
 
-        sorted_race = sorted(
-            [race for race in data.get('response', [])
-             if (datetime.fromisoformat(race['date']).replace(tzinfo=None) < datetime.now().replace(tzinfo=None)) and race['type'] == 'Race'],
-            key=lambda race: datetime.fromisoformat(race['date'])
-        )
 
-        if len(sorted_race) == 0:
-            raise requests.exceptions.RequestException("No races found for the season.")
+def prompt_season():
+    season = int(ask("Enter the Year of Season [bold red][2012 onwards][/bold red]: ").strip())
+    if not valid_season(season):
+        console_.print("Sorry  No data available before 2012 and after current Year..")
+        return None
+    return season
 
-        console_.print(f"[bold magenta]Displaying races of the season {season}:[/bold magenta]")
 
-        race_table = table.Table(
-            title="[yellow]Season Races", show_lines=True)
+def prompt_timezone():
+    """Ask for a continent and city until both are valid; None if timezones can't be fetched."""
+    timezones = fetch_timezones()
+    if not timezones:
+        console_.print(f"[bold red]Could not fetch timezones.[/bold red]")
+        pause(2)
+        return None
 
-        race_table.add_column(
-            "[bold white]Index", justify="center", style="cyan", no_wrap=True)
-        race_table.add_column(
-            "[bold white]Race", justify="center", style="green", no_wrap=True)
-        race_table.add_column(
-            "[bold white]Date", justify="center", style="magenta", no_wrap=True)
+    while True:
+        console_.print(f"[bold magenta]Available timezones: [/bold magenta]")
+        for continent in timezones.keys():
+            console_.print(f"{continent}")
 
-        index = 1
-        for race in sorted_race:
-            race_name = race['competition']['name']
-            race_date_obj = datetime.fromisoformat(race['date'].replace('Z', '+00:00'))
-            race_date = race_date_obj.strftime("%d-%m-%Y")
-            race_id = str(race['id'])
+        selected_tz = ask("\nSelect your timezone continent: ").strip().title()
+        if selected_tz not in timezones:
+            console_.print("[bold red]Invalid selection![/bold red]")
+            pause(2)
+            continue
 
-            race_table.add_row(str(index), race_name, race_date)
+        console_.print(f"[bold magenta]Available cities in {selected_tz}: [/bold magenta]")
+        for city in timezones[selected_tz]:
+            console_.print(city)
 
-            index += 1
+        selected_city = ask("\nSelect your timezone city: ").strip().title()
+        if selected_city not in timezones[selected_tz]:
+            console_.print("[bold red]Invalid city selection![/bold red]")
+            pause(2)
+            continue
 
-        console_.print(race_table)
+        return f"{selected_tz}/{selected_city}"
+
+
+@profiler.stage("render")
+def make_table(title, columns, rows, highlight=()):
+    """The rich table every view prints; rows whose index is in highlight are drawn in bold yellow."""
+    table_ = table.Table(title=f"[yellow]{title}", show_lines=True)
+    for header, style in columns:
+        table_.add_column(f"[bold white]{header}", justify="center", style=style, no_wrap=True)
+    for index, row in enumerate(rows):
+        table_.add_row(*("" if value is None else str(value) for value in row),
+                       style="bold yellow" if index in highlight else None)
+    return table_
+
+
+def print_table(title, columns, rows):
+    console_.print(make_table(title, columns, rows))
+
+
+class Pager:
+    """Interactive table that lays out and paints one page of rows at a time.
+
+    Rows are pulled from the iterator only when a page reaches them. At the
+    prompt, Enter or n shows the next page, p the previous one, /text keeps
+    the rows containing text (a bare / clears it) and q leaves; any other
+    answer, such as the index of a row to open, is returned to the caller.
+    """
+
+    def __init__(self, title, columns, rows, page_size=None):
+        self.title = title
+        self.columns = columns
+        self.rows = iter(rows)
+        self.loaded = []
+        self.matching = []
+        self.query = ""
+        self.page = 0
+        # show_lines takes two lines per row; leave room for the title, header and prompt
+        self.page_size = page_size or max(5, (console_.height - 8) // 2)
+
+    def matches(self, row):
+        return not self.query or any(self.query in fold(str(value)) for value in row if value is not None)
+
+    def pull(self, count):
+        """Load rows until count of them pass the filter or the iterator runs out."""
+        while len(self.matching) < count:
+            row = next(self.rows, None)
+            if row is None:
+                return
+            self.loaded.append(row)
+            if self.matches(row):
+                self.matching.append(row)
+
+    def filter(self, text):
+        self.query = fold(text.strip())
+        self.matching = [row for row in self.loaded if self.matches(row)]
+        self.page = 0
+
+    def window(self):
+        start = self.page * self.page_size
+        self.pull(start + self.page_size + 1)  # one row more tells whether there is a next page
+        return self.matching[start:start + self.page_size]
+
+    @property
+    def has_next(self):
+        return len(self.matching) > (self.page + 1) * self.page_size
+
+    @profiler.stage("render")
+    def render(self):
+        rows = self.window()
+        print_table(self.title, self.columns, rows)
+        first = self.page * self.page_size + 1
+        status = f"rows {first}-{first + len(rows) - 1}" if rows else "no rows"
+        if self.query:
+            status += f" matching '{self.query}'"
+        keys = ["Enter/n next"] if self.has_next else []
+        keys += ["p previous"] if self.page else []
+        keys += ["/text filter", "q back"]
+        console_.print(f"[dim]Page {self.page + 1}, {status} · {' · '.join(keys)}[/dim]")
+
+    def run(self, prompt="> "):
+        """Page until the user answers something other than a paging key and return it.
+
+        Enter on the last page returns "" and q returns None.
+        """
+        while True:
+            self.render()
+            answer = ask(prompt).strip()
+            key = answer.lower()
+            if key in ("", "n") and self.has_next:
+                self.page += 1
+            elif answer == "":
+                return ""
+            elif key == "p":
+                self.page = max(0, self.page - 1)
+            elif answer.startswith("/"):
+                self.filter(answer[1:])
+            elif key == "q":
+                return None
+            elif key != "n":
+                return answer
+
+
+def choose(title, columns, rows, prompt):
+    """Page through rows and return the index the user typed, or 0 (no row) for anything else."""
+    answer = Pager(title, columns, rows).run(prompt)
+    return int(answer) if answer and answer.isdigit() else 0
+
+
+OUTPUT_FORMATS = ("table", "json", "ndjson", "csv")
+
+
+def field_name(header):
+    return header.lower().replace("/", "_").replace(" ", "_").replace("-", "_")
+
+
+@profiler.stage("render")
+def emit(title, columns, rows, fmt="table"):
+    """Write rows in the requested output format as they are produced.
+
+    Only "table" goes through rich; the machine formats stream each row to
+    stdout as soon as it is built, so large exports never hold a table in
+    memory or pay its layout cost.
+    """
+    if fmt == "table":
+        print_table(title, columns, rows)
+        return
+
+    fields = [field_name(header) for header, _ in columns]
+    out = sys.stdout
+    if fmt == "csv":
+        writer = csv.writer(out)
+        writer.writerow(fields)
+        for row in rows:
+            writer.writerow(row)
+    elif fmt == "ndjson":
+        for row in rows:
+            out.write(json.dumps(dict(zip(fields, row))) + "\n")
+    else:
+        out.write("[")
+        for index, row in enumerate(rows):
+            out.write(("," if index else "") + "\n  " + json.dumps(dict(zip(fields, row))))
+        out.write("\n]\n")
+
+
+def flatten(item):
+    return ": ".join(map(str, item.values())) if isinstance(item, dict) else str(item)
+
+
+@profiler.stage("render")
+def emit_record(record, printer, fmt="table"):
+    """Write a single detail record (driver, circuit, team) in the requested format."""
+    if fmt == "table":
+        printer(record)
+    elif fmt == "csv":
+        writer = csv.DictWriter(sys.stdout, fieldnames=list(record))
+        writer.writeheader()
+        writer.writerow({key: "; ".join(flatten(item) for item in value) if isinstance(value, list) else value
+                         for key, value in record.items()})
+    else:
+        sys.stdout.write(json.dumps(record, indent=2 if fmt == "json" else None) + "\n")
+
+
+SCHEDULE_COLUMNS = [("Race", "cyan"), ("Circuit", "green"), ("Race Type", "blue"), ("Date/Time", "magenta")]
+SEASON_RACE_COLUMNS = [("Index", "cyan"), ("Race", "green"), ("Date", "magenta")]
+TEAM_RANKING_COLUMNS = [("Position", "cyan"), ("Team", "green"), ("Points", "magenta")]
+DRIVER_RANKING_COLUMNS = [("Position", "cyan"), ("Driver Name", "green"), ("Team Name", "blue"),
+                          ("Points", "magenta"), ("Wins", "purple")]
+COUNTDOWN_COLUMNS = [("Index", "cyan"), ("Race", "green"), ("Date/Time", "magenta"), ("Time Left", "blue")]
+CAREER_COLUMNS = [("Season", "cyan"), ("Team Name", "blue"), ("Position", "green"), ("Points", "magenta"), ("Wins", "purple")]
+SEARCH_COLUMNS = [("Kind", "cyan"), ("Id", "blue"), ("Name", "green"), ("Detail", "magenta")]
+
+# kind -> (table title, columns, error message)
+RACE_RANKINGS = {
+    "races": ("Race Results",
+              [("Position", "cyan"), ("Driver", "green"), ("Team", "blue"), ("Time", "magenta")],
+              "Error fetching result of race...⛓️‍💥"),
+    "fastestlaps": ("Fastest Lap Results",
+                    [("Ranking", "cyan"), ("Driver", "green"), ("Team", "blue"), ("Fastest Time", "magenta")],
+                    "Error fetching fastest lap data of race...⛓️‍💥"),
+    "startinggrid": ("Starting Grid Results",
+                     [("Position", "cyan"), ("Driver", "green"), ("Team", "blue"), ("Best Qualify Time", "magenta")],
+                     "Error fetching starting grid of race...⛓️‍💥"),
+}
 
-        if selected_index is None:
-            selected_index = int(input("Enter the index of the race you want to see details for: "))
-        else:
-            selected_index = 1
 
-        if 1 <= selected_index <= len(sorted_race):
-            selected_race = sorted_race[selected_index - 1]
-            race_id = selected_race['id']
-            race_name = selected_race['competition']['name']  # Assign race_name here
+class Race(NamedTuple):
+    """One session of a season, parsed once from the /races payload."""
+    id: int
+    name: str
+    circuit: str
+    type: str
+    date: datetime
 
-        else:
-            raise UnboundLocalError("Invalid race index selected.")
 
-        return race_id, race_name
+def parse_race(race):
+    date = datetime.fromisoformat(race['date'].replace('Z', '+00:00'))
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return Race(race['id'], race['competition']['name'], race['circuit']['name'], race['type'], date)
 
-    except requests.exceptions.RequestException as e:
-        console_.print(f"[bold red]Error fetching races data: {e}[/bold red]")
-        time.sleep(2)
-        sub_menu()
-    except (KeyError, UnboundLocalError):
-        console_.print(f"[bold red]Race ID not Found![/bold red]")
-        time.sleep(2)
-        sub_menu()
-    except (ValueError, IndexError, requests.exceptions.RequestException) as e:
-        console_.print(f"[bold red]Error fetching races data: {e}[/bold red]")
-        time.sleep(2)
-        sub_menu()
 
+def season_races(season, client=None):
+    """Every session of a season as Race records, in calendar order."""
+    data = (client or api).get("races", season=season)
+    return sorted(map(parse_race, data.get('response', [])), key=attrgetter('date'))
 
 
-def fetch_driver_info(driver_id):
-    url1 = f"{api_url}/drivers?id={driver_id}"
+def split_races(races, now=None):
+    """Split calendar-ordered races into (upcoming soonest first, past latest first)."""
+    now = now or datetime.now(timezone.utc)
+    cut = bisect.bisect_right(races, now, key=attrgetter('date'))
+    return races[cut:], races[cut - 1::-1] if cut else []
 
-    try:
-        response = requests.request("GET", url1, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-        '''        if data.get('errors') and 'requests' in data['errors']:
-                    raise requests.exceptions.RequestException'''
 
-        driver_details = data.get('response', [])
+def race_weekend(races, now=None, margin=timedelta(hours=36)):
+    """True when any of the calendar-ordered sessions is within margin of now."""
+    now = now or datetime.now(timezone.utc)
+    start = bisect.bisect_left(races, now - margin, key=attrgetter('date'))
+    return start < len(races) and races[start].date <= now + margin
 
-        if driver_details:
-            driver_info = driver_details[0]
-            console_.print(f"[magenta]Driver Name: [bold]{driver_info['name']}")
-            console_.print(f"[green]Nationality: [bold]{driver_info['nationality']}")
-            console_.print(f"[green]Birthdate: [bold]{driver_info['birthdate']}")
-            console_.print(f"[green]Podiums: [bold]{driver_info['podiums']}")
-            console_.print(f"[green]World Championships: [bold]{driver_info['world_championships']}")
-            teams_by_season = []
-            for team in driver_info['teams']:
-                season = team['season']
-                team_name = team['team']['name']
-                teams_by_season.append(f"Season: {season} - Team: {team_name}")
-            console_.print(f"[green]Teams by seasons: \n[bold]{'\n'.join(teams_by_season)}")
 
-    except requests.exceptions.RequestException as e:
-        console_.print(f"[bold red]Error fetching race schedule...⛓️‍💥[/bold red]")
-        time.sleep(2)
-    except KeyError:
-        console_.print("[bold red]Unexpected data format from API...🚨[/bold red]")
-        time.sleep(2)
+def in_session(races, now=None, length=SESSION_LENGTH):
+    """True while one of the calendar-ordered sessions is running (started less than length ago)."""
+    now = now or datetime.now(timezone.utc)
+    started = bisect.bisect_right(races, now, key=attrgetter('date'))
+    return started > 0 and now - races[started - 1].date <= length
 
-    sub_menu()
 
+def live_race(season):
+    """The Race session of the weekend under way, or else the latest completed race."""
+    races = [race for race in season_races(season) if race.type == 'Race']
+    now = datetime.now(timezone.utc)
+    current = [race for race in races if abs(race.date - now) <= timedelta(hours=36)]
+    return current[0] if current else pick(completed_races(season), -1)
 
-def race_schedule():
 
-    while True:
-        clear_screen()
-        season = int(console_.input("Enter the Year of Season [bold red][2012 onwards][/bold red]: ").strip())
-        if season < 2012 or season > datetime.now().year:
-            console_.print("Sorry No data available before 2012 and after current Year.")
-            sub_menu()
+def season_schedule(season):
+    """Return the (upcoming, past) sessions of a season, soonest/latest first."""
+    return split_races(season_races(season))
 
-        url = f"{api_url}/races?season={season}"
 
-        timezones = fetch_timezones()
-        if not timezones:
-            console_.print(f"[bold red]Could not fetch timezones.[/bold red]")
-            time.sleep(2)
-            sub_menu()
+def completed_races(season):
+    """Return the Grands Prix of a season that have already been run, in calendar order."""
+    past = split_races(season_races(season))[1]
+    return [race for race in reversed(past) if race.type == 'Race']
 
-        console_.print(f"[bold magenta]Available timezones: [/bold magenta]")
-        for continent in timezones.keys():
-            console_.print(f"{continent}")
 
-        selected_tz = input("\nSelect your timezone continent: ").strip().title()
-        if selected_tz not in timezones:
-            console_.print("[bold red]Invalid selection![/bold red]")
-            time.sleep(2)
-            continue
+def schedule_columns(user_timezones):
+    if len(user_timezones) == 1:
+        return SCHEDULE_COLUMNS
+    return SCHEDULE_COLUMNS[:-1] + [(f"Date/Time {user_timezone}", "magenta") for user_timezone in user_timezones]
 
-        console_.print(f"[bold magenta]Available cities in {selected_tz}: [/bold magenta]")
-        for city in timezones[selected_tz]:
-            console_.print(city)
 
-        selected_city = input("\nSelect your timezone city: ").strip().title()
-        if selected_city not in timezones[selected_tz]:
-            console_.print("[bold red]Invalid city selection![/bold red]")
-            time.sleep(2)
-            continue
+def schedule_rows(races, user_timezones):
+    """Rows of a schedule with one local Date/Time column per timezone."""
+    dates = [race.date for race in races]
+    local_times = [convert_localtimes(dates, user_timezone) for user_timezone in user_timezones]
+    for race, *times in zip(races, *local_times):
+        yield [race.name, race.circuit, race.type, *times]
 
-        break
 
-    user_timezone = f"{selected_tz}/{selected_city}"
+def season_race_rows(races):
+    for index, race in enumerate(races, start=1):
+        yield [index, race.name, race.date.strftime("%d-%m-%Y")]
 
-    try:
-        response = requests.request("GET", url, headers=headers, data=payload)
-        response.raise_for_status()
 
-        data = response.json()
+def countdown_rows(races, user_timezone):
+    now = datetime.now(timezone.utc)
+    for index, race in enumerate(races, start=1):
+        time_left = race.date - now
+        yield [index, race.name, format_localtime(race.date, user_timezone), str(time_left).split('.')[0]]
 
-        if data.get('errors') and 'requests' in data['errors']:
-            raise requests.exceptions.RequestException
 
-        with console_.status(f"[italic cyan]Fetching data for timezone: [/italic cyan] '{selected_tz}/{selected_city}'", spinner="dots3"):
-            time.sleep(4)
+def standings_rows(kind, season):
+    """Rows of the drivers' or teams' championship standings for a season."""
+    data = api.get(f"rankings/{kind}", season=season)
+    standings = sorted(data.get('response', []), key=lambda entry: entry['position'])
 
-        clear_screen()
+    if kind == "teams":
+        return ([entry['position'], entry['team']['name'], entry['points']]
+                for entry in standings)
+    return ([entry['position'], entry['driver']['name'], entry['team']['name'],
+             entry['points'], entry['wins']]
+            for entry in standings)
 
-        console_.print("[bold magenta]Race Schedule:[/bold magenta]")
-        #print(json.dumps(data, indent=2))
 
+def race_ranking_rows(kind, race_id, ttl=None):
+    """Rows of a race's results, fastest laps or starting grid."""
+    data = api.get(f"rankings/{kind}", ttl=ttl, race=race_id)
+    return ranking_rows(kind, data.get('response', []))
 
-        sorted_races = sorted([race for race in data.get('response', [])
-                               if (datetime.fromisoformat(race['date']).replace(tzinfo=None) > datetime.now().replace(tzinfo=None))],
-                        key=lambda race: datetime.fromisoformat(race['date']))
 
-        if sorted_races:
+def ranking_rows(kind, entries):
+    for entry in entries:
+        driver_time = entry['time']
+        if kind == "startinggrid" and driver_time is None:
+            driver_time = "DNF"
+        yield [entry['position'], entry['driver']['name'], entry['team']['name'], driver_time]
 
-            race_table = table.Table(title="[yellow]Upcoming Races", show_lines=True)
 
-            race_table.add_column("[bold white]Race", justify="center", style="cyan", no_wrap=True)
-            race_table.add_column("[bold white]Circuit", justify="center", style="green", no_wrap=True)
-            race_table.add_column("[bold white]Race Type",  justify="center", style="blue", no_wrap=True)
-            race_table.add_column("[bold white]Date/Time", justify="center", style="magenta", no_wrap=True)
+def career_rows(driver, career):
+    """One row per season: the driver's team(s) and championship standing."""
+    teams = {}
+    for team in driver.get('teams', []):
+        teams.setdefault(team['season'], []).append(team['team']['name'])
+    for season, entry in career:
+        if entry is None:
+            yield [season, ", ".join(teams.get(season, [])), None, None, None]
+        else:
+            yield [season, ", ".join(teams.get(season, [])), entry['position'], entry['points'], entry['wins']]
 
 
-            #data.get('response', []), key=lambda race: datetime.fromisoformat(race['date']))
-            for race in sorted_races:
-                race_name = race['competition']['name']
-                circuit_name = race['circuit']['name']
-                type_race = race['type']
-                race_date = race['date']
+# Async data layer: coroutines over the shared client so that screens made
+# of several requests issue them together instead of one after another.
 
-                local_race_time = conversion_to_localtime(race_date, user_timezone)
+async def fetch_async(endpoint, **params):
+    """api.get on a worker thread, so several calls can be awaited at once.
 
-                race_table.add_row(race_name, circuit_name, type_race, local_race_time)
+    Calls still go through the client's pooled session, cache, rate limiter
+    and in-flight coalescing.
+    """
+    return await asyncio.to_thread(api.get, endpoint, **params)
 
-            console_.print(race_table)
 
+async def get_races(season):
+    data = await fetch_async("races", season=season)
+    return sorted(map(parse_race, data.get('response', [])), key=attrgetter('date'))
 
-        race_table2 = table.Table(title="[yellow]Past Races", show_lines=True)
 
-        race_table2.add_column("[bold white]Race", justify="center", style="cyan", no_wrap=True)
-        race_table2.add_column("[bold white]Circuit", justify="center", style="green", no_wrap=True)
-        race_table2.add_column("[bold white]Race Type",  justify="center", style="blue", no_wrap=True)
-        race_table2.add_column("[bold white]Date/Time", justify="center", style="magenta", no_wrap=True)
+async def get_race_rankings(race_id, kind="races", ttl=None):
+    data = await fetch_async(f"rankings/{kind}", ttl=ttl, race=race_id)
+    return data.get('response', [])
 
 
-        sorted_races2 = sorted([race for race in data.get('response', [])
-                                if (datetime.fromisoformat(race['date']).replace(tzinfo=None) < datetime.now().replace(tzinfo=None))],
-                    key=lambda race: datetime.fromisoformat(race['date']), reverse = True)
+async def get_driver(driver_id):
+    data = await fetch_async("drivers", id=driver_id)
+    response = data.get('response', [])
+    return response[0] if response else None
 
-        for race in sorted_races2:
-            race_name = race['competition']['name']
-            circuit_name = race['circuit']['name']
-            type_race = race['type']
-            race_date = race['date']
 
-            local_race_time = conversion_to_localtime(race_date, user_timezone)
+async def get_team_list():
+    return (await fetch_async("teams")).get('response', [])
 
-            race_table2.add_row(race_name, circuit_name, type_race, local_race_time)
 
-        console_.print(race_table2)
+async def get_circuits():
+    return (await fetch_async("circuits")).get('response', [])
 
-    except requests.exceptions.RequestException as e:
-        console_.print(f"[bold red]Error fetching race schedule...⛓️‍💥[/bold red]")
-        time.sleep(2)
-    except KeyError:
-        console_.print("[bold red]Unexpected data format from API...🚨[/bold red]")
-        time.sleep(2)
 
-    sub_menu()
+async def get_weekend_rankings(race_id, ttl=None):
+    """Results, fastest laps and starting grid of a race, fetched concurrently."""
+    rankings = await asyncio.gather(*(get_race_rankings(race_id, kind, ttl) for kind in RACE_RANKINGS))
+    return dict(zip(RACE_RANKINGS, rankings))
 
 
-def race_statistics():
-    clear_screen()
+async def get_driver_career(driver_id):
+    """A driver's profile and (season, standings entry or None) for every season they raced."""
+    driver = await get_driver(driver_id)
+    if driver is None:
+        return None, []
+    seasons = sorted({team['season'] for team in driver.get('teams', []) if valid_season(team['season'])},
+                     reverse=True)
+    standings = await asyncio.gather(*(fetch_async("rankings/drivers", season=season) for season in seasons))
+    career = [(season, next((entry for entry in data.get('response', []) if entry['driver']['id'] == driver_id), None))
+              for season, data in zip(seasons, standings)]
+    return driver, career
 
-    '''
-    1.ranking of teams              -> season
-    2.ranking of drivers            -> season
-    3.ranking in race               -> race id
-    4.ranking fastest lap           -> race id
-    5.starting grid                 -> race id
-    '''
-    console_.print("[bold magenta]Choose from the options:[/bold magenta]")
-    table_1 = table.Table(title="\n[yellow]Race Statistics")
 
-    table_1.add_column("[bold white]Option[/bold white]", justify="center", style="cyan", no_wrap=True)
-    table_1.add_column("[bold white]Description[/bold white]", justify="center", style="green", no_wrap=True)
+async def poll_weekend_rankings(race_id):
+    """Fresh results, fastest laps and starting grid of a race, fetched concurrently.
 
-    table_1.add_row("1", "Team Ranking")
-    table_1.add_row("2", "Driver Ranking")
-    table_1.add_row("3", "Race Results")
-    table_1.add_row("4", "Fastest-Lap Time")
-    table_1.add_row("5", "Starting Grid")
-    table_1.add_row("6", "Return to Menu")
+    A ranking that could not be fetched comes back as its exception. Offline
+    or with the quota low, the local copies are used instead.
+    """
+    fetch = api.get if api.offline or api.limiter.quota_low else api.revalidate
+    rankings = await asyncio.gather(*(asyncio.to_thread(fetch, f"rankings/{kind}", race=race_id) for kind in RACE_RANKINGS),
+                                    return_exceptions=True)
+    return dict(zip(RACE_RANKINGS, rankings))
 
-    console_.print(table_1)
 
-    choice = int(input("Input your choice: ").strip())
-    clear_screen()
+def run_sync(coroutine):
+    """Sync facade for the menu code: run a data-layer coroutine to completion."""
+    with profiler.stage("fetch"):
+        return asyncio.run(coroutine)
 
-    match choice:
-        case 1: #Team Ranking
-            season = int(console_.input("Enter the Year of Season [bold red][2012 onwards][/bold red]: ").strip())
-            if season < 2012 or season > datetime.now().year:
-                console_.print("Sorry  No data available before 2012 and after current Year..")
-                sub_menu()
 
-            url = f"{api_url}/rankings/teams?season={season}"
+def weekend_rankings(race_id, ttl=None):
+    return run_sync(get_weekend_rankings(race_id, ttl))
 
+
+def driver_career(driver_id):
+    return run_sync(get_driver_career(driver_id))
+
+
+def fan_out(jobs, workers=4, report=None):
+    """Run zero-argument fetch jobs on a bounded thread pool.
+
+    Requests are paced by the client's rate limiter. Once the daily quota
+    is low the remaining jobs fail fast, leaving the reserve for
+    interactive use. Returns (succeeded, failed); report(done, total) is
+    called as each job ends.
+    """
+    def run_job(job):
+        if api.limiter.quota_low:
+            raise requests.exceptions.RequestException("daily API quota is nearly used up, keeping the rest for interactive use")
+        return job()
+
+    succeeded = failed = 0
+    with futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = [pool.submit(run_job, job) for job in jobs]
+        for done, future in enumerate(futures.as_completed(pending), start=1):
             try:
-                response = requests.request("GET", url, headers=headers, data=payload)
-                response.raise_for_status()
+                future.result()
+                succeeded += 1
+            except requests.exceptions.RequestException:
+                failed += 1
+            if report:
+                report(done, len(pending))
 
-                data = response.json()
-                if data.get('errors') and 'requests' in data['errors']:
-                    raise requests.exceptions.RequestException
+    return succeeded, failed
 
-                console_.print(f"[bold magenta]Team Ranking for {season}:[/bold magenta]")
-                # print(json.dumps(data, indent=2))
 
-                pos_table = table.Table(title="[yellow]Team Ranking", show_lines=True)
+def prefetch_season(season, workers=4, report=None, into_store=False):
+    """Fetch results, fastest laps and starting grid of every completed race concurrently.
 
-                pos_table.add_column("[bold white]Position", justify="center", style="cyan", no_wrap=True)
-                pos_table.add_column("[bold white]Team", justify="center", style="green", no_wrap=True)
-                pos_table.add_column("[bold white]Points",  justify="center", style="magenta", no_wrap=True)
+    The race list is fetched once, then every /rankings/<kind>?race= call runs
+    on a bounded thread pool, paced by the rate limiter, and lands in
+    the response cache, so later per-race views are served locally. Rankings
+    of finished seasons are kept forever. With into_store the responses are
+    also copied into the snapshot store for offline use. Returns
+    (fetched, already local, failed).
+    """
+    races = completed_races(season)
+    ttl = race_ttl(season)
+    fetch, have = (api.snapshot, api.stored) if into_store else (api.get, api.cached)
 
-                sorted_position = sorted(data.get('response', []), key=lambda race: race['position'])
-                for race in sorted_position:
-                    team_pos =str(race['position'])
-                    team_name = race['team']['name']
-                    team_points = str(race['points'])
+    jobs = [(f"rankings/{kind}", race.id) for race in races for kind in RACE_RANKINGS]
+    pending = [functools.partial(fetch, endpoint, ttl=ttl, race=race_id)
+               for endpoint, race_id in jobs if not have(endpoint, race=race_id)]
 
-                    pos_table.add_row(team_pos, team_name, team_points)
+    fetched, failed = fan_out(pending, workers, report)
+    return fetched, len(jobs) - len(pending), failed
 
-                console_.print(pos_table)
-            except requests.exceptions.RequestException as e:
-                console_.print(
-                    f"[bold red]Error fetching team rankings...⛓️‍💥[/bold red]")
-                time.sleep(2)
-            except KeyError:
-                console_.print("[bold red]Unexpected data format from API...🚨[/bold red]")
-                time.sleep(2)
 
-            sub_menu()
+HISTORY_ENDPOINTS = ("races", "rankings/drivers", "rankings/teams")
 
 
-        case 2: #Driver Ranking
-            season = int(console_.input("Enter the Year of Season [bold red][2012 onwards][/bold red]: ").strip())
-            if season < 2012 or season > datetime.now().year:
-                console_.print("Sorry  No data available before 2012 and after current Year..")
-                sub_menu()
-            url = f"{api_url}/rankings/drivers?season={season}"
+def all_seasons():
+    return list(range(FIRST_SEASON, datetime.now().year + 1))
 
-            try:
-                response = requests.request("GET", url, headers=headers, data=payload)
-                response.raise_for_status()
 
-                data = response.json()
-                if data.get('errors') and 'requests' in data['errors']:
-                    raise requests.exceptions.RequestException
+def load_history(seasons=None, workers=4, report=None):
+    """Download the races and driver/team standings of many seasons into the snapshot store.
 
-                console_.print(f"[bold magenta]Driver Ranking for {season}:[/bold magenta]")
-                # print(json.dumps(data, indent=2))
+    Every (endpoint, season) pair is one job on the bounded fan_out pool, so
+    the whole 2012-now history arrives in parallel, paced only by the rate
+    limiter. Finished seasons already in the store are skipped; the current
+    one is always refreshed. Returns (fetched, already stored, failed).
+    """
+    seasons = all_seasons() if seasons is None else seasons
+    current = datetime.now().year
+    wanted = [(endpoint, season) for season in seasons for endpoint in HISTORY_ENDPOINTS]
+    jobs = [functools.partial(api.snapshot, endpoint, season=season) for endpoint, season in wanted
+            if season == current or not api.stored(endpoint, season=season)]
+    fetched, failed = fan_out(jobs, workers, report)
+    return fetched, len(wanted) - len(jobs), failed
 
-                pos_table = table.Table(title="[yellow]Driver Ranking", show_lines=True)
 
-                pos_table.add_column("[bold white]Position", justify="center", style="cyan", no_wrap=True)
-                pos_table.add_column("[bold white]Driver Name", justify="center", style="green", no_wrap=True)
-                pos_table.add_column("[bold white]Team Name",  justify="center", style="blue", no_wrap=True)
-                pos_table.add_column("[bold white]Points", justify="center", style="magenta", no_wrap=True)
-                pos_table.add_column("[bold white]Wins",  justify="center", style="purple", no_wrap=True)
+def stored_history(endpoint, seasons=None):
+    """{season: response list} of one HISTORY_ENDPOINTS endpoint, read from the snapshot store only.
 
+    Seasons that were never loaded are left out, so cross-season analytics
+    never reach the network.
+    """
+    history = {}
+    for season in all_seasons() if seasons is None else seasons:
+        body = api.store.get(cache_key(endpoint, {"season": season})) if api.store is not None else None
+        if body is not None:
+            history[season] = decode_response(endpoint, body).get('response', [])
+    return history
 
-                sorted_driver_position = sorted(data.get('response', []), key=lambda race: race['position'])
-                for race in sorted_driver_position:
-                    driver_pos = str(race['position'])
-                    driver_name = race['driver']['name']
-                    team_name = race['team']['name']
-                    driver_points = str(race['points'])
-                    driver_wins = str(race['wins'])
 
-                    pos_table.add_row(driver_pos, driver_name, team_name, driver_points, driver_wins)
+POINTS_BY_POSITION = (25, 18, 15, 12, 10, 8, 6, 4, 2, 1)
+FASTEST_LAP_POINT_SEASONS = range(2019, 2025)
+STATS_FILE = os.path.join(data_dir, "results.npz")
 
-                console_.print(pos_table)
 
-            except requests.exceptions.RequestException as e:
-                console_.print(
-                    f"[bold red]Error fetching driver rankings...⛓️‍💥[/bold red]")
-                time.sleep(2)
-            except KeyError:
-                console_.print(
-                    "[bold red]Unexpected data format from API...🚨[/bold red]")
-                time.sleep(2)
-            sub_menu()
+def import_numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("'pitstop stats' needs NumPy, install it with: pip install numpy") from None
+    return numpy
+
+
+def local_response(endpoint, **params):
+    """The response list of a request from the snapshot store or cache (even expired), or None."""
+    key = cache_key(endpoint, params)
+    body = api.store.get(key) if api.store is not None else None
+    if body is None and api.cache is not None:
+        body = api.cache.get(key, stale=True)
+    return None if body is None else decode_response(endpoint, body).get('response', [])
+
+
+def grand_prix_points(season, position, fastest_lap):
+    points = POINTS_BY_POSITION[position - 1] if 0 < position <= len(POINTS_BY_POSITION) else 0
+    if fastest_lap and points and season in FASTEST_LAP_POINT_SEASONS:
+        points += 1
+    return points
+
+
+class ResultsTable:
+    """Every Grand Prix result as NumPy columns, one row per driver per race.
+
+    Columns are season, round, race, driver, team (API ids), position,
+    grid (0 when unknown), points (Grand Prix points, no sprints) and
+    fastest (set the race's fastest lap); driver and team names are kept
+    in id -> name dicts. Built from locally stored rankings only (history,
+    prefetch or sync) and saved as an .npz file, so every query below is a
+    handful of vectorized operations rather than a loop over JSON.
+    """
+
+    DTYPES = {"season": "int16", "round": "int16", "race": "int32", "driver": "int32", "team": "int32",
+              "position": "int16", "grid": "int16", "points": "float32", "fastest": "bool"}
+
+    def __init__(self, columns, drivers, teams):
+        self.columns = columns
+        self.drivers = drivers
+        self.teams = teams
+
+    def __len__(self):
+        return len(self.columns["race"])
+
+    @classmethod
+    def build(cls, seasons=None):
+        numpy = import_numpy()
+        rows, drivers, teams = [], {}, {}
+        for season in all_seasons() if seasons is None else seasons:
+            races = [race for race in sorted(map(parse_race, local_response("races", season=season) or []),
+                                             key=attrgetter('date')) if race.type == 'Race']
+            for round_, race in enumerate(races, start=1):
+                results = local_response("rankings/races", race=race.id)
+                if not results:
+                    continue
+                grid = {entry['driver']['id']: entry['position']
+                        for entry in local_response("rankings/startinggrid", race=race.id) or []}
+                fastest = next((entry['driver']['id'] for entry in local_response("rankings/fastestlaps", race=race.id) or []
+                                if entry['position'] == 1), None)
+                for entry in results:
+                    driver_id, team_id = entry['driver']['id'], entry['team']['id']
+                    drivers[driver_id] = entry['driver']['name']
+                    teams[team_id] = entry['team']['name']
+                    position = entry['position'] or 0
+                    rows.append((season, round_, race.id, driver_id, team_id, position,
+                                 grid.get(driver_id) or int(entry.get('grid') or 0),
+                                 grand_prix_points(season, position, driver_id == fastest), driver_id == fastest))
+
+        columns = {name: numpy.fromiter((row[index] for row in rows), dtype, count=len(rows))
+                   for index, (name, dtype) in enumerate(cls.DTYPES.items())}
+        return cls(columns, drivers, teams)
+
+    def save(self, path):
+        numpy = import_numpy()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        numpy.savez_compressed(
+            path, **self.columns,
+            driver_ids=numpy.array(list(self.drivers), dtype="int32"), driver_names=numpy.array(list(self.drivers.values())),
+            team_ids=numpy.array(list(self.teams), dtype="int32"), team_names=numpy.array(list(self.teams.values())),
+        )
 
-        case 3: #Race Results
-            season = int(console_.input("Enter the Year of Season [bold red][2012 onwards][/bold red]: ").strip())
-            if season < 2012 or season > datetime.now().year:
-                console_.print("Sorry  No data available before 2012 and after current Year..")
-                sub_menu()
+    @classmethod
+    def load(cls, path):
+        numpy = import_numpy()
+        with numpy.load(path) as data:
+            columns = {name: data[name] for name in cls.DTYPES}
+            drivers = dict(zip(data["driver_ids"].tolist(), data["driver_names"].tolist()))
+            teams = dict(zip(data["team_ids"].tolist(), data["team_names"].tolist()))
+        return cls(columns, drivers, teams)
+
+    def mask(self, seasons=None):
+        numpy = import_numpy()
+        if seasons is None:
+            return numpy.ones(len(self), dtype=bool)
+        return numpy.isin(self.columns["season"], seasons)
+
+    def per_driver(self, values, mask):
+        """(driver ids, row counts, sums of values) grouped by driver over the masked rows."""
+        numpy = import_numpy()
+        drivers, codes = numpy.unique(self.columns["driver"][mask], return_inverse=True)
+        return drivers, numpy.bincount(codes), numpy.bincount(codes, weights=values[mask])
+
+    def average_finish(self, seasons=None):
+        """[driver, races, mean finishing position], best first."""
+        mask = self.mask(seasons) & (self.columns["position"] > 0)
+        drivers, races, total = self.per_driver(self.columns["position"], mask)
+        return self._ranked(drivers, races, total / races, descending=False)
+
+    def grid_delta(self, seasons=None):
+        """[driver, races, mean places gained from grid to finish], most gained first."""
+        mask = self.mask(seasons) & (self.columns["position"] > 0) & (self.columns["grid"] > 0)
+        gained = self.columns["grid"].astype("int32") - self.columns["position"]
+        drivers, races, total = self.per_driver(gained, mask)
+        return self._ranked(drivers, races, total / races, descending=True)
+
+    def fastest_lap_counts(self, seasons=None):
+        """[driver, races, fastest laps], most first; drivers without one are left out."""
+        drivers, races, total = self.per_driver(self.columns["fastest"], self.mask(seasons))
+        keep = total > 0
+        return self._ranked(drivers[keep], races[keep], total[keep], descending=True)
+
+    def points_progression(self, driver_id, season):
+        """[round, race, points, cumulative points] of one driver through a season."""
+        numpy = import_numpy()
+        mask = (self.columns["season"] == season) & (self.columns["driver"] == driver_id)
+        order = numpy.argsort(self.columns["round"][mask], kind="stable")
+        rounds, races, points = (self.columns[name][mask][order] for name in ("round", "race", "points"))
+        return [[int(round_), int(race), int(points_), int(total)]
+                for round_, race, points_, total in zip(rounds, races, points, numpy.cumsum(points))]
+
+    def _ranked(self, drivers, races, values, descending):
+        numpy = import_numpy()
+        order = numpy.argsort(-values if descending else values, kind="stable")
+        return [[self.drivers.get(int(drivers[index]), drivers[index]), int(races[index]), round(float(values[index]), 2)]
+                for index in order]
+
+
+def results_table(rebuild=False):
+    """The saved ResultsTable of every locally held season, built on first use or when rebuild is set.
+
+    Queries narrow it down to seasons with a mask, so the file always
+    covers everything; invalidate_results_table() drops it when new data lands.
+    """
+    if rebuild or not os.path.exists(STATS_FILE):
+        results = ResultsTable.build()
+        results.save(STATS_FILE)
+        return results
+    return ResultsTable.load(STATS_FILE)
+
+
+def invalidate_results_table():
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(STATS_FILE)
+
+
+def fold(name):
+    """Case- and accent-insensitive form of a name: 'Kimi Räikkönen' -> 'kimi raikkonen'."""
+    return "".join(char for char in unicodedata.normalize("NFKD", name) if not unicodedata.combining(char)).casefold()
+
+
+class SearchMatch(NamedTuple):
+    kind: str
+    id: int
+    name: str
+    detail: str
+
+
+class SearchIndex:
+    """SQLite index of every driver, team and circuit name found in local data.
+
+    Looks a name up by id, by the start of any of its words ("ham",
+    "lewis h") or, failing that, by closest spelling ("hamiltn"), without
+    listing or downloading anything.
+    """
+
+    FUZZY_CUTOFF = 0.75
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self._conn = None
+
+    @property
+    def conn(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS names ("
+                "kind TEXT NOT NULL, id INTEGER NOT NULL, name TEXT NOT NULL, folded TEXT NOT NULL, "
+                "detail TEXT NOT NULL, PRIMARY KEY (kind, id))"
+            )
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value REAL NOT NULL)")
+        return self._conn
+
+    def built(self):
+        """When the index was last rebuilt (epoch seconds), or None if never."""
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'built'").fetchone()
+        return None if row is None else row[0]
+
+    def replace(self, matches):
+        with self.lock:
+            self.conn.execute("DELETE FROM names")
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO names (kind, id, name, folded, detail) VALUES (?, ?, ?, ?, ?)",
+                ((match.kind, match.id, match.name, fold(match.name), match.detail) for match in matches),
+            )
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('built', ?)", (time.time(),))
+            self.conn.commit()
+
+    def search(self, query, kind=None, limit=10):
+        """Matches of kind (or any kind) for an id or a name, best first."""
+        text = fold(query.strip())
+        kinds = (kind, kind) if kind else (None, None)
+        if text.isdigit():
+            sql, args = "id = ?", (int(text),)
+        else:
+            words = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            sql, args = "(folded LIKE ? ESCAPE '\\' OR folded LIKE ? ESCAPE '\\')", (f"{words}%", f"% {words}%")
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT kind, id, name, detail FROM names WHERE (? IS NULL OR kind = ?) AND {sql} "
+                "ORDER BY folded = ? DESC, kind, name LIMIT ?", (*kinds, *args, text, limit)).fetchall()
+            if rows or text.isdigit():
+                return [SearchMatch(*row) for row in rows]
+            candidates = self.conn.execute("SELECT kind, id, name, detail, folded FROM names "
+                                           "WHERE ? IS NULL OR kind = ?", kinds).fetchall()
+
+        def score(folded):
+            return max(difflib.SequenceMatcher(None, text, part).ratio() for part in (folded, *folded.split()))
+
+        scored = sorted(((score(row[4]), row) for row in candidates), key=lambda pair: pair[0], reverse=True)
+        return [SearchMatch(*row[:4]) for ratio, row in scored[:limit] if ratio >= self.FUZZY_CUTOFF]
 
-            race_id, race_name = fetch_races(season)
 
-            url = f"{api_url}/rankings/races?race={race_id}"
+search_index = SearchIndex(os.path.join(data_dir, "search.sqlite3"))
 
+
+def build_search_index():
+    """Rebuild search_index from every locally held season plus the team and circuit catalogs.
+
+    Only the current season's standings and the two catalogs may be
+    fetched, and only when they are in neither the cache nor the store.
+    """
+    def catalog(endpoint, **params):
+        response = local_response(endpoint, **params)
+        if response is not None:
+            return response
+        try:
+            return api.get(endpoint, **params).get('response', [])
+        except requests.exceptions.RequestException:
+            return []
+
+    drivers = {}
+    for season in all_seasons():  # oldest first, so each driver keeps their latest team
+        standings = local_response("rankings/drivers", season=season)
+        if standings is None and season == datetime.now().year:
+            standings = catalog("rankings/drivers", season=season)
+        for entry in standings or []:
+            drivers[entry['driver']['id']] = SearchMatch(
+                "driver", entry['driver']['id'], entry['driver']['name'], f"{season} {entry['team']['name']}")
+
+    matches = list(drivers.values())
+    matches.extend(SearchMatch("team", team['id'], team['name'], team.get('base') or "")
+                   for team in catalog("teams"))
+    matches.extend(SearchMatch("circuit", circuit['id'], circuit['name'],
+                               ", ".join(filter(None, (circuit.get('competition') or {}).get('location', {}).values())))
+                   for circuit in catalog("circuits"))
+    search_index.replace(matches)
+    return len(matches)
+
+
+def lookup(kind, query):
+    """Matches of kind for a name or id, building the index on first use.
+
+    A miss rebuilds an index older than a day once, in case the name is new.
+    """
+    built = search_index.built()
+    if built is None:
+        build_search_index()
+    matches = search_index.search(query, kind)
+    if not matches and built is not None and time.time() - built > CATALOG_TTL:
+        build_search_index()
+        matches = search_index.search(query, kind)
+    exact = [match for match in matches if fold(match.name) == fold(query)]
+    return exact if len(exact) == 1 else matches
+
+
+def sync(seasons, workers=4, report=None):
+    """Download catalogs, seasons, per-race rankings and driver profiles into the snapshot store.
+
+    Finished seasons already in the store are skipped. Returns (fetched, failed).
+    """
+    jobs = [functools.partial(api.snapshot, endpoint) for endpoint in ("timezone", "circuits", "teams")]
+    fetched, failed = fan_out(jobs, workers, report)
+    fetched_history, _, failed_history = load_history(seasons, workers, report)
+    fetched += fetched_history
+    failed += failed_history
+
+    driver_ids = set()
+    for season in seasons:
+        try:
+            fetched_rankings, _, failed_rankings = prefetch_season(season, workers, report, into_store=True)
+            fetched += fetched_rankings
+            failed += failed_rankings
+            driver_ids.update(entry['driver']['id'] for entry in api.get("rankings/drivers", season=season).get('response', []))
+        except requests.exceptions.RequestException:
+            failed += 1
+
+    driver_jobs = [functools.partial(api.snapshot, "drivers", id=driver_id) for driver_id in sorted(driver_ids)]
+    fetched_drivers, failed_drivers = fan_out(driver_jobs, workers, report)
+    return fetched + fetched_drivers, failed + failed_drivers
+
+
+class PollSchedule:
+    """Adaptive polling interval for watch mode.
+
+    Any change snaps it back to min_interval; every quiet poll doubles it,
+    up to four times min_interval while a session is running and
+    max_interval between sessions.
+    """
+
+    def __init__(self, min_interval=WATCH_MIN_INTERVAL, max_interval=WATCH_MAX_INTERVAL):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+
+    def next(self, changed, session_running):
+        ceiling = min(self.max_interval, self.min_interval * 4) if session_running else self.max_interval
+        self.interval = self.min_interval if changed else min(self.interval * 2, ceiling)
+        return self.interval
+
+
+class WeekendBoard:
+    """What watch mode shows: a status line and one table per race ranking.
+
+    update() diffs the new rows against the shown ones; only a ranking with
+    changed rows gets a new table (those rows highlighted until the next
+    poll), the others keep the table already built.
+    """
+
+    def __init__(self, race):
+        self.race = race
+        self.rows = {kind: [] for kind in RACE_RANKINGS}
+        self.highlighted = {kind: set() for kind in RACE_RANKINGS}
+        self.tables = {}
+        self.status = ""
+        self.dirty = False  # a table was rebuilt since the last repaint
+
+    def update(self, rankings):
+        """Take a poll's {kind: response or exception}; returns True if any row changed."""
+        changed = False
+        for kind, data in rankings.items():
+            if isinstance(data, Exception):
+                continue  # keep showing the last good rows
+            rows = [tuple(row) for row in ranking_rows(kind, data.get('response', []))]
+            old = self.rows[kind]
+            diff = {index for index, row in enumerate(rows) if index >= len(old) or old[index] != row}
+            if kind not in self.tables or diff or len(rows) != len(old):
+                changed = True
+            elif not self.highlighted[kind]:
+                continue
+            self.rows[kind] = rows
+            self.highlighted[kind] = diff if old else set()  # a first fill is not news
+            title, columns, _ = RACE_RANKINGS[kind]
+            self.tables[kind] = make_table(title, columns, rows, self.highlighted[kind])
+            self.dirty = True
+        return changed
+
+    def __rich__(self):
+        return console.Group(f"[bold magenta]{self.race.name}[/bold magenta]  [dim]{self.status}[/dim]",
+                             *(self.tables[kind] for kind in RACE_RANKINGS if kind in self.tables))
+
+
+def watch(race, min_interval=WATCH_MIN_INTERVAL, max_interval=WATCH_MAX_INTERVAL, polls=None):
+    """Keep a race's rankings on screen, polling on a PollSchedule until Ctrl-C (or polls polls)."""
+    board = WeekendBoard(race)
+    schedule = PollSchedule(min_interval, max_interval)
+    sessions = season_races(race.date.year)
+    last_change = None
+    with live.Live(board, console=console_, auto_refresh=False) as live_:
+        count = 0
+        while polls is None or count < polls:
+            with profiler.stage("fetch"):
+                rankings = asyncio.run(poll_weekend_rankings(race.id))
+            changed = board.update(rankings)
+            failed = [kind for kind, data in rankings.items() if isinstance(data, Exception)]
+            if changed:
+                last_change = datetime.now()
+            interval = schedule.next(changed, in_session(sessions))
+
+            status = f"last change {last_change:%H:%M:%S}" if last_change else "no data yet"
+            status += f" · checking every {interval}s"
+            if failed:
+                status += f" · {len(failed)} ranking(s) failed to update"
+            if board.dirty or status != board.status:
+                board.status = status
+                board.dirty = False
+                live_.refresh()  # nothing new means nothing to repaint
+            count += 1
+            if polls is None or count < polls:
+                time.sleep(interval)
+    return board
+
+
+class Refresher(threading.Thread):
+    """Keeps the current season's schedule and standings fresh in the background.
+
+    Those are what the screens show most and they only change after a
+    session, so instead of making a view wait on the API when its copy
+    expires, the view gets the last good copy straight away (see
+    APIClient.revalidator) and this thread replaces it: every interval
+    seconds, every weekend_interval during a race weekend, or as soon as a
+    view asks via kick(). listeners are called with (endpoint, params, data)
+    whenever a fresher copy lands.
+    """
+
+    def __init__(self, client, interval=REFRESH_INTERVAL, weekend_interval=WEEKEND_REFRESH_INTERVAL):
+        super().__init__(name="pitstop-refresher", daemon=True)
+        self.client = client
+        self.interval = interval
+        self.weekend_interval = weekend_interval
+        self.listeners = []
+        self.wake = threading.Event()
+        self.stopped = threading.Event()
+
+    def targets(self):
+        season = datetime.now().year
+        return [("races", {"season": season}),
+                ("rankings/drivers", {"season": season}),
+                ("rankings/teams", {"season": season})]
+
+    def watches(self, key):
+        return any(cache_key(endpoint, params) == key for endpoint, params in self.targets())
+
+    def kick(self):
+        self.wake.set()
+
+    def stop(self):
+        self.stopped.set()
+        self.wake.set()
+
+    def run(self):
+        only_expired = True  # a fresh copy from the last session is good enough at startup
+        while not self.stopped.is_set():
+            interval = self.interval
+            try:
+                self.refresh_once(only_expired)
+                interval = self.next_interval()
+            except Exception:  # a locked cache, a failing listener or odd data must not end the thread
+                pass
+            only_expired = False
+            self.wake.clear()  # anything asked for during the pass has just been refreshed
+            self.wake.wait(interval)
+
+    def refresh_once(self, only_expired=False):
+        for endpoint, params in self.targets():
+            if self.stopped.is_set() or self.client.offline or self.client.limiter.quota_low:
+                return
+            if only_expired and self.client.cached(endpoint, **params):
+                continue
             try:
-                response = requests.request(
-                    "GET", url, headers=headers, data=payload)
-                response.raise_for_status()
+                data = self.client.revalidate(endpoint, **params)
+            except requests.exceptions.RequestException:
+                continue  # keep serving the last good copy
+            for listener in self.listeners:
+                listener(endpoint, params, data)
 
-                data = response.json()
-                if data.get('errors') and 'requests' in data['errors']:
-                    raise requests.exceptions.RequestException
+    def next_interval(self):
+        try:
+            weekend = race_weekend(season_races(datetime.now().year, self.client))
+        except requests.exceptions.RequestException:
+            weekend = False
+        return self.weekend_interval if weekend else self.interval
 
-                console_.print(f"[bold magenta]Displaying race result of {race_name}:[/bold magenta]")
-                # print(json.dumps(data, indent=2))
 
-                result_table = table.Table(
-                    title= f"[yellow]Race Results", show_lines=True)
+def fetch_races(season, selected_index = None):
+    try:
+        sorted_race = completed_races(season)
 
-                result_table.add_column(
-                    "[bold white]Position", justify="center", style="cyan", no_wrap=True)
-                result_table.add_column(
-                    "[bold white]Driver", justify="center", style="green", no_wrap=True)
-                result_table.add_column(
-                    "[bold white]Team", justify="center", style="blue", no_wrap=True)
-                result_table.add_column(
-                    "[bold white]Time", justify="center", style="magenta", no_wrap=True)
+        if len(sorted_race) == 0:
+            raise requests.exceptions.RequestException("No races found for the season.")
 
-                races = data.get('response', [])
-                for race in races:
-                    driver_pos = str(race['position'])
-                    driver_name = race['driver']['name']
-                    team_name = race['team']['name']
-                    driver_time = race['time']
+        console_.print(f"[bold magenta]Displaying races of the season {season}:[/bold magenta]")
+        if selected_index is None:
+            selected_index = choose("Season Races", SEASON_RACE_COLUMNS, season_race_rows(sorted_race),
+                                    "Enter the index of the race you want to see details for: ")
+        else:
+            print_table("Season Races", SEASON_RACE_COLUMNS, season_race_rows(sorted_race))
 
-                    result_table.add_row(driver_pos, driver_name, team_name, driver_time)
+        if 1 <= selected_index <= len(sorted_race):
+            selected_race = sorted_race[selected_index - 1]
+            race_id = selected_race.id
+            race_name = selected_race.name
+        else:
+            raise UnboundLocalError("Invalid race index selected.")
 
-                console_.print(result_table)
+        return race_id, race_name
 
-            except requests.exceptions.RequestException as e:
-                console_.print(
-                    f"[bold red]Error fetching result of race...⛓️‍💥[/bold red]")
-                time.sleep(2)
-            except KeyError:
-                console_.print(
-                    "[bold red]Unexpected data format from API...🚨[/bold red]")
-                time.sleep(2)
-            sub_menu()
+    except requests.exceptions.RequestException as e:
+        console_.print(f"[bold red]Error fetching races data: {e}[/bold red]")
+        pause(2)
+    except (KeyError, UnboundLocalError):
+        console_.print(f"[bold red]Race ID not Found![/bold red]")
+        pause(2)
+    except (ValueError, IndexError) as e:
+        console_.print(f"[bold red]Error fetching races data: {e}[/bold red]")
+        pause(2)
 
-        case 4: #Fastest-Lap Time
-            season = int(console_.input("Enter the Year of Season [bold red][2012 onwards][/bold red]: ").strip())
-            if season < 2012 or season > datetime.now().year:
-                console_.print("Sorry  No data available before 2012 and after current Year..")
-                sub_menu()
 
-            race_id, race_name = fetch_races(season)
+def driver_record(driver_info):
+    return {
+        "name": driver_info['name'],
+        "nationality": driver_info['nationality'],
+        "birthdate": driver_info['birthdate'],
+        "podiums": driver_info['podiums'],
+        "world_championships": driver_info['world_championships'],
+        "teams": [{"season": team['season'], "team": team['team']['name']} for team in driver_info['teams']],
+    }
 
-            url = f"{api_url}/rankings/fastestlaps?race={race_id}"
 
-            try:
-                response = requests.request(
-                    "GET", url, headers=headers, data=payload)
-                response.raise_for_status()
+def circuit_record(selected_circuit):
+    competition = selected_circuit.get('competition', {})
+    lap_record = selected_circuit.get('lap_record', {})
+    return {
+        "circuit": selected_circuit['name'],
+        "race_name": competition.get('name', 'N/A'),
+        "country": competition.get('location', {}).get('country', 'N/A'),
+        "city": competition.get('location', {}).get('city', 'N/A'),
+        "first_grand_prix": selected_circuit.get('first_grand_prix', 'N/A'),
+        "laps": selected_circuit.get('laps', 'N/A'),
+        "length": selected_circuit.get('length', 'N/A'),
+        "race_distance": selected_circuit.get('race_distance', 'N/A'),
+        "lap_record_time": lap_record.get('time', 'N/A'),
+        "lap_record_driver": lap_record.get('driver', 'N/A'),
+        "lap_record_year": lap_record.get('year', 'N/A'),
+    }
 
-                data = response.json()
-                if data.get('errors') and 'requests' in data['errors']:
-                    raise requests.exceptions.RequestException
 
-                console_.print(f"[bold magenta]Displaying race result of {race_name}:[/bold magenta]")
-                # print(json.dumps(data, indent=2))
+def team_record(selected_team):
+    return {
+        "team": selected_team['name'],
+        "base": selected_team['base'],
+        "world_championships": selected_team.get('world_championships', 'N/A'),
+        "pole_positions": selected_team.get('pole_positions', 'N/A'),
+        "fastest_laps": selected_team.get('fastest_laps', 'N/A'),
+        "president": selected_team['president'],
+        "director": selected_team['director'],
+        "technical_manager": selected_team['technical_manager'],
+        "chassis": selected_team['chassis'],
+        "engine": selected_team['engine'],
+    }
 
-                fastlap_table = table.Table(
-                    title=f"[yellow]Fastest Lap Results", show_lines=True)
 
-                fastlap_table.add_column(
-                    "[bold white]Ranking", justify="center", style="cyan", no_wrap=True)
-                fastlap_table.add_column(
-                    "[bold white]Driver", justify="center", style="green", no_wrap=True)
-                fastlap_table.add_column(
-                    "[bold white]Team", justify="center" , style="blue", no_wrap=True)
-                fastlap_table.add_column(
-                    "[bold white]Fastest Time", justify="center", style="magenta", no_wrap=True)
+@profiler.stage("render")
+def print_driver(record):
+    console_.print(f"[magenta]Driver Name: [bold]{record['name']}")
+    console_.print(f"[green]Nationality: [bold]{record['nationality']}")
+    console_.print(f"[green]Birthdate: [bold]{record['birthdate']}")
+    console_.print(f"[green]Podiums: [bold]{record['podiums']}")
+    console_.print(f"[green]World Championships: [bold]{record['world_championships']}")
+    teams_by_season = [f"Season: {team['season']} - Team: {team['team']}" for team in record['teams']]
+    console_.print(f"[green]Teams by seasons: \n[bold]{'\n'.join(teams_by_season)}")
 
-                races = data.get('response', [])
-                for race in races:
-                    driver_pos = str(race['position'])
-                    driver_name = race['driver']['name']
-                    team_name = race['team']['name']
-                    driver_time = race['time']
 
-                    fastlap_table.add_row(driver_pos, driver_name, team_name, driver_time)
+@profiler.stage("render")
+def print_circuit(record):
+    console_.print(f"[magenta]Circuit: [bold]{record['circuit']}")
+    console_.print(f"[green]Race Name: [bold]{record['race_name']}")
+    console_.print(f"[green]Country: [bold]{record['country']}[/bold]\tCity: [bold]{record['city']}[/bold]")
+    console_.print(f"[green]First Grand Prix: [bold]{record['first_grand_prix']}")
+    console_.print(f"[green]No. of laps: [bold]{record['laps']}")
+    console_.print(f"[green]Circuit Length: [bold]{record['length']}[/bold]\tDistance: [bold]{record['race_distance']}[/bold]")
 
-                console_.print(fastlap_table)
+    console_.print(f"[bold magenta]Fastest Lap Record:")
+    console_.print(f"[green]Time: [bold]{record['lap_record_time']}[/bold]\t\tby: [bold]{record['lap_record_driver']}[/bold]\t\t Year: [bold]{record['lap_record_year']}[/bold]")
 
-            except requests.exceptions.RequestException as e:
-                console_.print(
-                    f"[bold red]Error fetching fastest lap data of race...⛓️‍💥[/bold red]")
-                time.sleep(2)
-            except KeyError:
-                console_.print(
-                    "[bold red]Unexpected data format from API...🚨[/bold red]")
-                time.sleep(2)
-            sub_menu()
 
-        case 5: #Starting Grid
-            season = int(console_.input("Enter the Year of Season [bold red][2012 onwards][/bold red]: ").strip())
-            if season < 2012 or season > datetime.now().year:
-                console_.print("Sorry  No data available before 2012 and after current Year..")
-                sub_menu()
+@profiler.stage("render")
+def print_team(record):
+    console_.print(f"[magenta]Team: [bold]{record['team']}")
+    console_.print(f"[green]Base: [bold]{record['base']}")
+    console_.print(f"[green]World Championships: [bold]{record['world_championships']}")
+    console_.print(f"[green]Team Poles: [bold]{record['pole_positions']}")
+    console_.print(f"[green]Fastest Laps: [bold]{record['fastest_laps']}")
+    console_.print(f"[green]President: [bold]{record['president']}")
+    console_.print(f"[green]Director: [bold]{record['director']}")
+    console_.print(f"[green]Manager: [bold]{record['technical_manager']}")
+    console_.print(f"[green]Chassis: [bold]{record['chassis']}[/bold]\tEngine: [bold]{record['engine']}[/bold]")
+
 
-            race_id, race_name = fetch_races(season)
+def fetch_driver_info(driver_id):
+    try:
+        data = api.get("drivers", id=driver_id)
 
-            url = f"{api_url}/rankings/startinggrid?race={race_id}"
+        driver_details = data.get('response', [])
 
-            try:
-                response = requests.request(
-                    "GET", url, headers=headers, data=payload)
-                response.raise_for_status()
+        if driver_details:
+            print_driver(driver_record(driver_details[0]))
+
+    except requests.exceptions.RequestException as e:
+        console_.print(f"[bold red]Error fetching race schedule...⛓️‍💥[/bold red]")
+        pause(2)
+    except KeyError:
+        console_.print("[bold red]Unexpected data format from API...🚨[/bold red]")
+        pause(2)
 
-                data = response.json()
-                if data.get('errors') and 'requests' in data['errors']:
-                    raise requests.exceptions.RequestException
 
-                console_.print(f"[bold magenta]Displaying race result of {race_name}:[/bold magenta]")
-                # print(json.dumps(data, indent=2))
+def race_schedule():
+    clear_screen()
+    season = prompt_season()
+    if season is None:
+        return sub_menu()
 
-                startgrid_table = table.Table(
-                    title=f"[yellow]Starting Grid Results", show_lines=True)
+    user_timezone = prompt_timezone()
+    if user_timezone is None:
+        return sub_menu()
 
-                startgrid_table.add_column(
-                    "[bold white]Position", justify="center", style="cyan", no_wrap=True)
-                startgrid_table.add_column(
-                    "[bold white]Driver", justify="center", style="green", no_wrap=True)
-                startgrid_table.add_column(
-                    "[bold white]Team", justify="center", style="blue", no_wrap=True)
-                startgrid_table.add_column(
-                    "[bold white]Best Qualify Time", justify="center", style="magenta", no_wrap=True)
+    try:
+        upcoming, past = season_schedule(season)
 
-                races = data.get('response', [])
-                for race in races:
-                    driver_pos = str(race['position'])
-                    driver_name = race['driver']['name']
-                    team_name = race['team']['name']
-                    driver_time = race['time'] if race['time'] is not None else "DNF"
+        with console_.status(f"[italic cyan]Fetching data for timezone: [/italic cyan] '{user_timezone}'", spinner="dots3"):
+            pause(4)
 
-                    startgrid_table.add_row(
-                        driver_pos, driver_name, team_name, driver_time)
+        clear_screen()
 
-                console_.print(startgrid_table)
+        console_.print("[bold magenta]Race Schedule:[/bold magenta]")
+
+        if upcoming:
+            print_table("Upcoming Races", SCHEDULE_COLUMNS, schedule_rows(upcoming, [user_timezone]))
+
+        Pager("Past Races", SCHEDULE_COLUMNS, schedule_rows(past, [user_timezone])).run()
+
+    except requests.exceptions.RequestException as e:
+        console_.print(f"[bold red]Error fetching race schedule...⛓️‍💥[/bold red]")
+        pause(2)
+    except KeyError:
+        console_.print("[bold red]Unexpected data format from API...🚨[/bold red]")
+        pause(2)
+
+    return sub_menu()
+
+
+def race_ranking_view(kind):
+    season = prompt_season()
+    if season is None:
+        return sub_menu()
+
+    selected_race = fetch_races(season)
+    if selected_race is None:
+        return sub_menu()
+    race_id, race_name = selected_race
+
+    title, columns, error_message = RACE_RANKINGS[kind]
+    try:
+        rows = race_ranking_rows(kind, race_id, race_ttl(season))
+        console_.print(f"[bold magenta]Displaying race result of {race_name}:[/bold magenta]")
+        print_table(title, columns, rows)
+
+    except requests.exceptions.RequestException as e:
+        console_.print(f"[bold red]{error_message}[/bold red]")
+        pause(2)
+    except KeyError:
+        console_.print("[bold red]Unexpected data format from API...🚨[/bold red]")
+        pause(2)
+    return sub_menu()
+
+
+def race_statistics():
+    clear_screen()
+
+    '''
+    1.ranking of teams              -> season
+    2.ranking of drivers            -> season
+    3.ranking in race               -> race id
+    4.ranking fastest lap           -> race id
+    5.starting grid                 -> race id
+    '''
+    console_.print("[bold magenta]Choose from the options:[/bold magenta]")
+    table_1 = table.Table(title="\n[yellow]Race Statistics")
+
+    table_1.add_column("[bold white]Option[/bold white]", justify="center", style="cyan", no_wrap=True)
+    table_1.add_column("[bold white]Description[/bold white]", justify="center", style="green", no_wrap=True)
+
+    table_1.add_row("1", "Team Ranking")
+    table_1.add_row("2", "Driver Ranking")
+    table_1.add_row("3", "Race Results")
+    table_1.add_row("4", "Fastest-Lap Time")
+    table_1.add_row("5", "Starting Grid")
+    table_1.add_row("6", "Live Watch")
+    table_1.add_row("7", "Return to Menu")
+
+    console_.print(table_1)
+
+    choice = int(ask("Input your choice: ").strip())
+    clear_screen()
+
+    match choice:
+        case 1: #Team Ranking
+            season = prompt_season()
+            if season is None:
+                return sub_menu()
+
+            try:
+                rows = standings_rows("teams", season)
+                console_.print(f"[bold magenta]Team Ranking for {season}:[/bold magenta]")
+                print_table("Team Ranking", TEAM_RANKING_COLUMNS, rows)
 
             except requests.exceptions.RequestException as e:
                 console_.print(
-                    f"[bold red]Error fetching fastest lap data of race...⛓️‍💥[/bold red]")
-                time.sleep(2)
+                    f"[bold red]Error fetching team rankings...⛓️‍💥[/bold red]")
+                pause(2)
+            except KeyError:
+                console_.print("[bold red]Unexpected data format from API...🚨[/bold red]")
+                pause(2)
+
+            return sub_menu()
+
+        case 2: #Driver Ranking
+            season = prompt_season()
+            if season is None:
+                return sub_menu()
+
+            try:
+                rows = standings_rows("drivers", season)
+                console_.print(f"[bold magenta]Driver Ranking for {season}:[/bold magenta]")
+                print_table("Driver Ranking", DRIVER_RANKING_COLUMNS, rows)
+
+            except requests.exceptions.RequestException as e:
+                console_.print(
+                    f"[bold red]Error fetching driver rankings...⛓️‍💥[/bold red]")
+                pause(2)
             except KeyError:
                 console_.print(
                     "[bold red]Unexpected data format from API...🚨[/bold red]")
-                time.sleep(2)
-            sub_menu()
+                pause(2)
+            return sub_menu()
+
+        case 3: #Race Results
+            return race_ranking_view("races")
+
+        case 4: #Fastest-Lap Time
+            return race_ranking_view("fastestlaps")
+
+        case 5: #Starting Grid
+            return race_ranking_view("startinggrid")
 
-        case 6: #Return to Menu
+        case 6: #Live Watch
+            try:
+                race = live_race(datetime.now().year)
+                console_.print("[dim]Press Ctrl-C to stop watching.[/dim]")
+                watch(race)
+            except KeyboardInterrupt:
+                pass
+            except (requests.exceptions.RequestException, IndexError):
+                console_.print("[bold red]No race to watch this season...⛓️‍💥[/bold red]")
+                pause(2)
+            return sub_menu()
+
+        case 7: #Return to Menu
             with console_.status(f"[italic cyan]Returning to Menu [/italic cyan]", spinner="dots3"):
-                time.sleep(4)
-            menu()
+                pause(4)
+            return "menu"
         case _:
             console_.print("[bold red]Invalid option selection![/bold red]")
-            time.sleep(2)
-            sub_menu()
+            pause(2)
+            return sub_menu()
+
+def prompt_lookup(kind):
+    """Ask for a name to look up; returns the chosen id, or None to pick from the full list instead."""
+    query = ask(f"Search {kind}s by name, or press Enter to list them all: ").strip()
+    if not query:
+        return None
+    matches = lookup(kind, query)
+    if not matches:
+        console_.print(f"[bold red]No {kind} matches '{query}', listing them all instead.[/bold red]")
+        return None
+    if len(matches) == 1:
+        return matches[0].id
+
+    print_table(f"{kind.title()}s matching '{query}'", [("Index", "cyan"), ("Name", "green"), ("Detail", "magenta")],
+                ([str(index), match.name, match.detail] for index, match in enumerate(matches, start=1)))
+    selected_index = int(ask(f"Enter the index of the {kind} you want to see details for: "))
+    return matches[selected_index - 1].id if 1 <= selected_index <= len(matches) else None
+
 
 def general_queries():
     clear_screen()
@@ -703,341 +2408,366 @@ def general_queries():
 
     console_.print(table_option)
 
-    choice = int(input("Input your choice: ").strip())
+    choice = int(ask("Input your choice: ").strip())
 
     match choice:
         case 1: #Countdown
             clear_screen()
             season = datetime.now().year
-            url = f"{api_url}/races?season={season}"
-
-            while True:
-                timezones = fetch_timezones()
-                if not timezones:
-                    console_.print(f"[bold red]Could not fetch timezones.[/bold red]")
-                    time.sleep(2)
-                    sub_menu()
-
-                console_.print(f"[bold magenta]Available timezones: [/bold magenta]")
-                for continent in timezones.keys():
-                    console_.print(f"{continent}")
-
-                selected_tz = input("\nSelect your timezone continent: ").strip().title()
-                if selected_tz not in timezones:
-                    console_.print("[bold red]Invalid selection![/bold red]")
-                    time.sleep(2)
-                    continue
 
-                console_.print(f"[bold magenta]Available cities in {selected_tz}: [/bold magenta]")
-                for city in timezones[selected_tz]:
-                    console_.print(city)
+            user_timezone = prompt_timezone()
+            if user_timezone is None:
+                return sub_menu()
 
-                selected_city = input("\nSelect your timezone city: ").strip().title()
-                if selected_city not in timezones[selected_tz]:
-                    console_.print("[bold red]Invalid city selection![/bold red]")
-                    time.sleep(2)
-                    continue
-
-                break
-
-            user_timezone = f"{selected_tz}/{selected_city}"
-
-            try: #hellochanges
-                response = requests.request("GET", url, headers=headers, data=payload)
-                response.raise_for_status()
-
-                data = response.json()
-                if data.get('errors') and 'requests' in data['errors']:
-                    raise requests.exceptions.RequestException
+            try:
+                sorted_races = [race for race in season_schedule(season)[0] if race.type == 'Race']
 
-                with console_.status(f"[italic cyan]Fething data for timezone: [/italic cyan] '{selected_tz}/{selected_city}'", spinner="dots3"):
-                    time.sleep(3)
+                with console_.status(f"[italic cyan]Fething data for timezone: [/italic cyan] '{user_timezone}'", spinner="dots3"):
+                    pause(3)
 
                 clear_screen()
 
                 console_.print("[bold magenta]Race Countdown:[/bold magenta]")
-                # print(json.dumps(data, indent=2))
-
-                countdown_table = table.Table(title="[yellow]Countdown to Next Races", show_lines=True)
 
-                countdown_table.add_column("[bold white]Index", justify="center", style="cyan", no_wrap=True)
-                countdown_table.add_column("[bold white]Race", justify="center", style="green", no_wrap=True)
-                '''countdown_table.add_column("Circuit", justify="center", style="green")
-                countdown_table.add_column("Race Type", justify="center", style="white")
-                countdown_table.add_column("Date/Time", justify="center", style="magenta")'''
+                print_table("Countdown to Next Races", COUNTDOWN_COLUMNS[:2],
+                            ([str(index), race.name] for index, race in enumerate(sorted_races, start=1)))
 
-                sorted_races = sorted(
-                    [race for race in data.get('response', []) if (datetime.fromisoformat(race['date']).replace(tzinfo=None) > datetime.now().replace(tzinfo=None) and race['type'] == 'Race')],
-                    key=lambda race: datetime.fromisoformat(race['date'])
-                )
-
-                index = 1
-                for race in sorted_races:
-                    race_name = race['competition']['name']
-                    race_date = race['date']
-                    '''
-                    circuit_name = race['circuit']['name']
-                    type_race = race['type']
-                    '''
-                    local_race_time = conversion_to_localtime(race_date, user_timezone)
-
-                    countdown_table.add_row(str(index), race_name)
-
-                    index += 1
-
-                console_.print(countdown_table)
-
-                selected_index = int(input("Enter the index of the race you want to see details for: "))
+                selected_index = int(ask("Enter the index of the race you want to see details for: "))
 
                 if 1 <= selected_index <= len(sorted_races):
                     selected_race = sorted_races[selected_index - 1]
-
-                    race_name = selected_race['competition']['name']
-                    circuit_name = selected_race['circuit']['name']
-                    race_date = selected_race['date']
-                    local_race_time = conversion_to_localtime(race_date, user_timezone)
+                    _, race_name, local_race_time, time_left = list(countdown_rows([selected_race], user_timezone))[0]
 
                     # Print detailed info about the selected race
                     console_.print(f"\n[magenta]Details for: [bold]{race_name}")
-                    console_.print(f"[green]Circuit: [bold]{circuit_name}")
+                    console_.print(f"[green]Circuit: [bold]{selected_race.circuit}")
                     console_.print(f"[green]Date/Time: [bold]{local_race_time}")
-                    local_race_time = datetime.strptime(local_race_time, "%d-%m-%Y %H:%M")
-                    current_time = datetime.now()
-                    diff = local_race_time - current_time
-                    console_.print(f"[green]Time Left: [bold]{diff}")
+                    console_.print(f"[green]Time Left: [bold]{time_left}")
                 else:
                     console_.print("[bold red]Invalid index. Please enter a valid race index. [/bold red]")
-                    sub_menu()
+                    return sub_menu()
 
             except requests.exceptions.RequestException as e:
                 console_.print(
                     f"[bold red]Error fetching race schedule...⛓️‍💥[/bold red]")
-                time.sleep(2)
+                pause(2)
             except KeyError:
                 console_.print("[bold red]Unexpected data format from API...🚨[/bold red]")
-                time.sleep(2)
-            sub_menu()
+                pause(2)
+            return sub_menu()
 
 
         case 2: # Circuits
-            url = f"{api_url}/circuits"
             try:
-                response = requests.request("GET", url, headers=headers, data=payload)
-                response.raise_for_status()
-
-                data = response.json()
-                if data.get('errors') and 'requests' in data['errors']:
-                    raise requests.exceptions.RequestException
-
-                console_.print("[bold magenta]Circuits :[/bold magenta]")
-                # print(json.dumps(data, indent=2))
-
-                circuit_table = table.Table(title="[yellow]Circuit Selection", show_lines=True)
-
-                circuit_table.add_column("[bold white]Index", justify="center", style="cyan", no_wrap=True)
-                circuit_table.add_column("[bold white]Circuit", justify="center", style="green", no_wrap=True)
-                '''circuit_table.add_column("Race", justify="center", style="cyan", no_wrap=True)
-                circuit_table.add_column("Race Type", justify="center", style="white")
-                circuit_table.add_column("Date/Time", justify="center", style="magenta")'''
+                circuit_id = prompt_lookup("circuit")
+                data = api.get("circuits")
 
                 circuits =  data.get('response', [])
-
-                index = 1
-                for circuit in circuits:
-                    circuit_name = circuit['name']
-                    '''
-                    race_name = race['competition']['name']
-                    race_date = race['date']
-                    type_race = race['type']
-                    '''
-                    circuit_table.add_row(str(index), circuit_name)
-
-                    index += 1
-
-                console_.print(circuit_table)
-
-                selected_index = int(input("Enter the index of the race you want to see details for: "))
-
-                if 1 <= selected_index <= len(circuits):
-                    selected_circuit = circuits[selected_index - 1]
-
-                    circuit_name = selected_circuit['name']
-                    race_name = selected_circuit.get('competition', {}).get('name', 'N/A')
-                    race_country = selected_circuit.get('competition', {}).get('location', {}).get('country', 'N/A')
-                    race_city = selected_circuit.get('competition', {}).get('location', {}).get('city', 'N/A')
-                    first_gp = selected_circuit.get('first_grand_prix', 'N/A')
-                    no_laps = selected_circuit.get('laps', 'N/A')
-                    race_length = selected_circuit.get('length', 'N/A')
-                    race_dist = selected_circuit.get('race_distance', 'N/A')
-
-                    lap_record = selected_circuit.get('lap_record', {})
-                    lap_rec_time = lap_record.get('time', 'N/A')
-                    lap_rec_driver = lap_record.get('driver', 'N/A')
-                    lap_rec_year = lap_record.get('year', 'N/A')
-
-                    console_.print(f"[magenta]Circuit: [bold]{circuit_name}")
-                    console_.print(f"[green]Race Name: [bold]{race_name}")
-                    console_.print(f"[green]Country: [bold]{race_country}[/bold]\tCity: [bold]{race_city}[/bold]")
-                    console_.print(f"[green]First Grand Prix: [bold]{first_gp}")
-                    console_.print(f"[green]No. of laps: [bold]{no_laps}")
-                    console_.print(f"[green]Circuit Length: [bold]{race_length}[/bold]\tDistance: [bold]{race_dist}[/bold]")
-
-                    console_.print(f"[bold magenta]Fastest Lap Record:")
-                    console_.print(f"[green]Time: [bold]{lap_rec_time}[/bold]\t\tby: [bold]{lap_rec_driver}[/bold]\t\t Year: [bold]{lap_rec_year}[/bold]")
+                if circuit_id is not None:
+                    print_circuit(circuit_record({circuit['id']: circuit for circuit in circuits}[circuit_id]))
                 else:
-                    console_.print("[bold red]Invalid index. Please enter a valid race index.")
+                    console_.print("[bold magenta]Circuits :[/bold magenta]")
+                    selected_index = choose("Circuit Selection", [("Index", "cyan"), ("Circuit", "green")],
+                                            ([str(index), circuit['name']] for index, circuit in enumerate(circuits, start=1)),
+                                            "Enter the index of the race you want to see details for: ")
+
+                    if 1 <= selected_index <= len(circuits):
+                        print_circuit(circuit_record(circuits[selected_index - 1]))
+                    else:
+                        console_.print("[bold red]Invalid index. Please enter a valid race index.")
 
             except requests.exceptions.RequestException as e:
                 console_.print(
                     f"[bold red]Error fetching race schedule...⛓️‍💥[/bold red]")
-                time.sleep(2)
+                pause(2)
             except KeyError:
                 console_.print("[bold red]Unexpected data format from API...🚨[/bold red]")
-                time.sleep(2)
-            sub_menu()
+                pause(2)
+            return sub_menu()
 
         case 3: # Teams
-            url = f"{api_url}/teams"
             try:
-                response = requests.request("GET", url, headers=headers, data=payload)
-                response.raise_for_status()
-
-                data = response.json()
-                if data.get('errors') and 'requests' in data['errors']:
-                    raise requests.exceptions.RequestException
-
-                console_.print("[bold magenta]Circuits :[/bold magenta]")
-                # print(json.dumps(data, indent=2))
-
-                team_table = table.Table(title="[yellow]Team Selection", show_lines=True)
-
-                team_table.add_column("[bold white]Index", justify="center", style="cyan", no_wrap=True)
-                team_table.add_column("[bold white]Team", justify="center", style="green", no_wrap=True)
-                '''team_table.add_column("Race", justify="center", style="cyan", no_wrap=True)
-                team_table.add_column("Race Type", justify="center", style="white")
-                team_table.add_column("Date/Time", justify="center", style="magenta")'''
+                team_id = prompt_lookup("team")
+                data = api.get("teams")
 
                 teams =  data.get('response', [])
-
-                index = 1
-                for team in teams:
-                    team_name = team['name']
-                    '''
-                    race_name = race['competition']['name']
-                    race_date = race['date']
-                    type_race = race['type']
-                    '''
-                    team_table.add_row(str(index), team_name)
-
-                    index += 1
-
-                console_.print(team_table)
-
-                selected_index = int(input("Enter the index of the race you want to see details for: "))
-
-                if 1 <= selected_index <= len(teams):
-                    selected_team = teams[selected_index - 1]
-
-                    team_name = selected_team['name']
-                    team_base = selected_team['base']
-                    team_championships = selected_team.get('world_championships','N/A')
-                    team_poles = selected_team.get('pole_positions','N/A')
-                    team_fastest_laps = selected_team.get('fastest_laps','N/A')
-                    team_president = selected_team['president']
-                    team_director = selected_team['director']
-                    team_manager = selected_team['technical_manager']
-                    team_chassis = selected_team['chassis']
-                    team_engine = selected_team['engine']
-
-                    console_.print(f"[magenta]Team: [bold]{team_name}")
-                    console_.print(f"[green]Base: [bold]{team_base}")
-                    console_.print(f"[green]World Championships: [bold]{team_championships}")
-                    console_.print(f"[green]Team Poles: [bold]{team_poles}")
-                    console_.print(f"[green]Fastest Laps: [bold]{team_fastest_laps}")
-                    console_.print(f"[green]President: [bold]{team_president}")
-                    console_.print(f"[green]Director: [bold]{team_director}")
-                    console_.print(f"[green]Manager: [bold]{team_manager}")
-                    console_.print(f"[green]Chassis: [bold]{team_chassis}[/bold]\tEngine: [bold]{team_engine}[/bold]")
+                if team_id is not None:
+                    print_team(team_record({team['id']: team for team in teams}[team_id]))
                 else:
-                    console_.print("[bold red]Invalid index. Please enter a valid race index.")
+                    console_.print("[bold magenta]Teams :[/bold magenta]")
+                    selected_index = choose("Team Selection", [("Index", "cyan"), ("Team", "green")],
+                                            ([str(index), team['name']] for index, team in enumerate(teams, start=1)),
+                                            "Enter the index of the race you want to see details for: ")
+
+                    if 1 <= selected_index <= len(teams):
+                        print_team(team_record(teams[selected_index - 1]))
+                    else:
+                        console_.print("[bold red]Invalid index. Please enter a valid race index.")
 
             except requests.exceptions.RequestException as e:
                 console_.print(
                     f"[bold red]Error fetching race schedule...⛓️‍💥[/bold red]")
-                time.sleep(2)
+                pause(2)
             except KeyError:
                 console_.print("[bold red]Unexpected data format from API...🚨[/bold red]")
-                time.sleep(2)
-            sub_menu()
+                pause(2)
+            return sub_menu()
 
         case 4:
             season = datetime.now().year
-            url = f"{api_url}/rankings/drivers?season={season}"
 
             try:
-                response = requests.request("GET", url, headers=headers, data=payload)
-                response.raise_for_status()
-
-                data = response.json()
-                if data.get('errors') and 'requests' in data['errors']:
-                    raise requests.exceptions.RequestException
-
-                driv_table = table.Table(title="[yellow]Drivers", show_lines=True)
-
-                driv_table.add_column("[bold white]Index", justify="center", style="cyan", no_wrap=True)
-                driv_table.add_column("[bold white]Driver Name", justify="center", style="green", no_wrap=True)
-                '''
-                pos_table.add_column("[bold white]Team Name",  justify="center", style="blue", no_wrap=True)
-                pos_table.add_column("[bold white]Points", justify="center", style="magenta", no_wrap=True)
-                pos_table.add_column("[bold white]Wins",  justify="center", style="purple", no_wrap=True)
-                '''
-
-                index = 1
-                drivers = data.get('response', [])
-                for driver in drivers:
-                    driver_name = driver['driver']['name']
-                    '''driver_pos = str(race['position'])
-                    team_name = race['team']['name']
-                    driver_points = str(race['points'])
-                    driver_wins = str(race['wins'])'''
-
-                    driv_table.add_row(str(index), driver_name)
-
-                    index += 1
-
-                console_.print(driv_table)
-
-                selected_index = int(input("Enter the index of the driver you want to see details for: "))
+                driver_id = prompt_lookup("driver")
+                if driver_id is not None:
+                    fetch_driver_info(driver_id)
+                else:
+                    data = api.get("rankings/drivers", season=season)
 
-                if 1 <= selected_index <= len(drivers):
-                    selected_driver= drivers[selected_index - 1]
-                    driver_id = str(selected_driver['driver']['id'])
+                    drivers = data.get('response', [])
+                    selected_index = choose("Drivers", [("Index", "cyan"), ("Driver Name", "green")],
+                                            ([str(index), driver['driver']['name']] for index, driver in enumerate(drivers, start=1)),
+                                            "Enter the index of the driver you want to see details for: ")
 
-                fetch_driver_info(driver_id)
+                    if 1 <= selected_index <= len(drivers):
+                        selected_driver= drivers[selected_index - 1]
+                        driver_id = str(selected_driver['driver']['id'])
+                        fetch_driver_info(driver_id)
+                    else:
+                        console_.print("[bold red]Invalid index. Please enter a valid driver index.")
 
             except requests.exceptions.RequestException as e:
                 console_.print(
                     f"[bold red]Error fetching driver rankings...⛓️‍💥[/bold red]")
-                time.sleep(2)
+                pause(2)
             except KeyError:
                 console_.print(
                     "[bold red]Unexpected data format from API...🚨[/bold red]")
-                time.sleep(2)
-            sub_menu()
+                pause(2)
+            return sub_menu()
 
 
         case 5:
             with console_.status(f"[italic cyan]Returning to Menu [/italic cyan]", spinner="dots3"):
-                time.sleep(4)
+                pause(4)
             clear_screen()
-            menu()
+            return "menu"
 
         case _:
             console_.print("[bold red]Invalid city selection![/bold red]")
-            time.sleep(2)
-            sub_menu()
+            pause(2)
+            return sub_menu()
+
+
+def pick(items, index):
+    """1-based pick used by the headless commands; index -1 picks the last item."""
+    if index == -1 and items:
+        return items[-1]
+    if not 1 <= index <= len(items):
+        raise IndexError(f"index {index} out of range 1..{len(items)}")
+    return items[index - 1]
+
+
+def resolve_id(kind, words, fmt):
+    """The id of the one kind matching a command-line id or name.
+
+    When several match they are listed instead and None is returned.
+    """
+    query = " ".join(words)
+    if query.isdigit():
+        return int(query)
+    matches = lookup(kind, query)
+    if not matches:
+        raise KeyError(f"{kind} '{query}'")
+    if len(matches) > 1:
+        emit(f"{kind.title()}s matching '{query}'", SEARCH_COLUMNS, (list(match) for match in matches), fmt)
+        return None
+    return matches[0].id
+
+
+def run_command(args):
+    """Run one dashboard view without any prompts and return the exit status."""
+    try:
+        fmt = getattr(args, "format", "table")
+        match args.command:
+            case "schedule":
+                upcoming, past = season_schedule(args.season)
+                columns = schedule_columns(args.tz)
+                if fmt == "table":
+                    if upcoming:
+                        print_table("Upcoming Races", columns, schedule_rows(upcoming, args.tz))
+                    print_table("Past Races", columns, schedule_rows(past, args.tz))
+                else:
+                    emit("Race Schedule", [("Status", None)] + columns, itertools.chain(
+                        (["upcoming", *row] for row in schedule_rows(upcoming, args.tz)),
+                        (["past", *row] for row in schedule_rows(past, args.tz)),
+                    ), fmt)
+
+            case "countdown":
+                upcoming = [race for race in season_schedule(datetime.now().year)[0] if race.type == 'Race']
+                emit("Countdown to Next Races", COUNTDOWN_COLUMNS, countdown_rows(upcoming, args.tz), fmt)
+
+            case "standings":
+                title, columns = {
+                    "drivers": ("Driver Ranking", DRIVER_RANKING_COLUMNS),
+                    "teams": ("Team Ranking", TEAM_RANKING_COLUMNS),
+                }[args.kind]
+                emit(f"{title} {args.season}", columns, standings_rows(args.kind, args.season), fmt)
+
+            case "results" | "fastestlaps" | "grid":
+                kind = {"results": "races", "fastestlaps": "fastestlaps", "grid": "startinggrid"}[args.command]
+                race = pick(completed_races(args.season), args.race)
+                title, columns, _ = RACE_RANKINGS[kind]
+                emit(f"{title} - {race.name}", columns, race_ranking_rows(kind, race.id, race_ttl(args.season)), fmt)
+
+            case "weekend":
+                race = pick(completed_races(args.season), args.race)
+                rankings = weekend_rankings(race.id, race_ttl(args.season))
+                if fmt == "table":
+                    for kind, (title, columns, _) in RACE_RANKINGS.items():
+                        print_table(f"{title} - {race.name}", columns, ranking_rows(kind, rankings[kind]))
+                else:
+                    emit(race.name, [("Ranking", None), ("Position", None), ("Driver", None), ("Team", None), ("Time", None)],
+                         ([kind, *row] for kind in RACE_RANKINGS for row in ranking_rows(kind, rankings[kind])), fmt)
+
+            case "watch":
+                race = live_race(args.season) if args.race is None else pick(completed_races(args.season), args.race)
+                try:
+                    watch(race, args.min_interval, args.max_interval)
+                except KeyboardInterrupt:
+                    pass
+
+            case "career":
+                driver_id = resolve_id("driver", args.name, fmt)
+                if driver_id is None:
+                    return 0
+                driver, career = driver_career(driver_id)
+                if driver is None:
+                    raise KeyError(f"driver {driver_id}")
+                emit(f"{driver['name']} - Career", CAREER_COLUMNS, career_rows(driver, career), fmt)
+
+            case "driver":
+                driver_id = resolve_id("driver", args.name, fmt)
+                if driver_id is None:
+                    return 0
+                driver_details = api.get("drivers", id=driver_id).get('response', [])
+                if not driver_details:
+                    raise KeyError(f"driver {driver_id}")
+                emit_record(driver_record(driver_details[0]), print_driver, fmt)
+
+            case "circuit":
+                circuits = api.get("circuits").get('response', [])
+                query = " ".join(args.name)
+                if not query:
+                    emit("Circuits", [("Id", "cyan"), ("Circuit", "green")],
+                         ([circuit['id'], circuit['name']] for circuit in circuits), fmt)
+                elif (circuit_id := resolve_id("circuit", args.name, fmt)) is not None:
+                    selected = next((circuit for circuit in circuits if circuit['id'] == circuit_id), None)
+                    if selected is None:
+                        raise KeyError(f"circuit {circuit_id}")
+                    emit_record(circuit_record(selected), print_circuit, fmt)
+
+            case "team":
+                teams = api.get("teams").get('response', [])
+                query = " ".join(args.name)
+                if not query:
+                    emit("Teams", [("Id", "cyan"), ("Team", "green")],
+                         ([team['id'], team['name']] for team in teams), fmt)
+                elif (team_id := resolve_id("team", args.name, fmt)) is not None:
+                    selected = next((team for team in teams if team['id'] == team_id), None)
+                    if selected is None:
+                        raise KeyError(f"team {team_id}")
+                    emit_record(team_record(selected), print_team, fmt)
+
+            case "search":
+                if args.reindex:
+                    error_console.print(f"[dim]Indexed {build_search_index()} names[/dim]")
+                if args.name:
+                    query = " ".join(args.name)
+                    matches = lookup(args.kind, query)
+                    if not matches:
+                        raise KeyError(f"'{query}'")
+                    emit(f"Search '{query}'", SEARCH_COLUMNS, (list(match) for match in matches), fmt)
+
+            case "prefetch":
+                api.limiter.configure(args.rate)
+                with progress.Progress(console=error_console) as progress_:
+                    task = progress_.add_task(f"[cyan]Prefetching {args.season}...", total=None)
+                    fetched, cached, failed = prefetch_season(
+                        args.season, workers=args.workers,
+                        report=lambda done, total: progress_.update(task, completed=done, total=total))
+                console_.print(f"[bold green]{args.season}: fetched {fetched}, already cached {cached}, failed {failed}[/bold green]")
+                invalidate_results_table()
+                if failed:
+                    return 1
+
+            case "history":
+                if api.offline:
+                    error_console.print("[bold red]history needs the network, drop --offline[/bold red]")
+                    return 1
+                api.limiter.configure(args.rate)
+                with progress.Progress(console=error_console) as progress_:
+                    task = progress_.add_task("[cyan]Loading history...", total=None)
+                    fetched, stored, failed = load_history(args.season, workers=args.workers,
+                                                           report=lambda done, total: progress_.update(task, completed=done, total=total))
+                console_.print(f"[bold green]History: fetched {fetched}, already stored {stored}, failed {failed}[/bold green]")
+                build_search_index()
+                invalidate_results_table()
+                if failed:
+                    return 1
+
+            case "stats":
+                if args.query == "build":
+                    results = results_table(rebuild=True)
+                    console_.print(f"[bold green]Indexed {len(results)} results of {len(set(results.columns['race'].tolist()))} races "
+                                   f"into {STATS_FILE}[/bold green]")
+                elif args.query == "points":
+                    if args.driver is None or not args.season or len(args.season) != 1:
+                        error_console.print("[bold red]points needs --driver and a single --season[/bold red]")
+                        return 1
+                    results = results_table()
+                    name = results.drivers.get(args.driver, args.driver)
+                    emit(f"{name} - Points {args.season[0]}",
+                         [("Round", "cyan"), ("Race Id", "green"), ("Points", "blue"), ("Total", "magenta")],
+                         results.points_progression(args.driver, args.season[0]), fmt)
+                else:
+                    results = results_table()
+                    title, column, query = {
+                        "average-finish": ("Average Finishing Position", "Average Position", results.average_finish),
+                        "grid-delta": ("Places Gained From Grid", "Average Places Gained", results.grid_delta),
+                        "fastest-laps": ("Fastest Laps", "Fastest Laps", results.fastest_lap_counts),
+                    }[args.query]
+                    emit(title, [("Driver Name", "green"), ("Races", "cyan"), (column, "magenta")], query(args.season), fmt)
+
+            case "sync":
+                if api.offline:
+                    error_console.print("[bold red]sync needs the network, drop --offline[/bold red]")
+                    return 1
+                seasons = all_seasons() if args.all else args.season
+                api.limiter.configure(args.rate)
+                with progress.Progress(console=error_console) as progress_:
+                    task = progress_.add_task("[cyan]Syncing...", total=None)
+                    fetched, failed = sync(seasons, workers=args.workers,
+                                           report=lambda done, total: progress_.update(task, completed=done, total=total))
+                console_.print(f"[bold green]Synced {len(seasons)} season(s): fetched {fetched}, failed {failed}[/bold green]")
+                build_search_index()
+                invalidate_results_table()
+                if failed:
+                    return 1
 
+    except requests.exceptions.RequestException as e:
+        error_console.print(f"[bold red]Error fetching data from API: {e}[/bold red]")
+        return 1
+    except pytz.UnknownTimeZoneError as e:
+        error_console.print(f"[bold red]Unknown timezone: {e}[/bold red]")
+        return 1
+    except (KeyError, IndexError) as e:
+        error_console.print(f"[bold red]Not found: {e}[/bold red]")
+        return 1
+    except ImportError as e:
+        error_console.print(f"[bold red]{e}[/bold red]")
+        return 1
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
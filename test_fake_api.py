@@ -0,0 +1,305 @@
+import os
+import sys
+import json
+import time
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import requests
+import pitstop
+from pitstop import APIClient
+from fake_api import Faults, start_server
+
+
+@pytest.fixture
+def server():
+    server = start_server()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def client(url, timeout=(3.05, 10)):
+    return APIClient(url, {}, retries=0, timeout=timeout)
+
+
+def test_serves_recorded_fixture(server):
+    data = client(server.url).get("races", season=2023)
+    assert data["results"] == len(data["response"]) > 0
+    assert {race["season"] for race in data["response"]} == {2023}
+    assert server.hits == 1
+
+
+def test_missing_fixture_is_empty_result(server):
+    assert client(server.url).get("drivers", id=999999)["response"] == []
+
+
+def test_injected_server_error(server):
+    server.faults = Faults(error_rate=1)
+    with pytest.raises(requests.exceptions.RequestException):
+        client(server.url).get("circuits")
+
+
+def test_injected_quota_error(server):
+    server.faults = Faults(quota_rate=1)
+    with pytest.raises(requests.exceptions.RequestException, match="request limit"):
+        client(server.url).get("circuits")
+
+
+def test_rate_limited_and_failed_responses_still_update_the_limiter(server):
+    server.quota = 100
+    server.faults = Faults(error_rate=1)
+    api = APIClient(server.url, {}, retries=0)
+    with pytest.raises(requests.exceptions.HTTPError):
+        api.get("circuits")
+    assert api.limiter.daily_remaining == 99  # read from the 503 before it was raised
+
+    server.faults = Faults(limit_rate=1)
+    api = APIClient(server.url, {}, retries=2, backoff=0, limiter=pitstop.RateLimiter(per_minute=600))
+    acquired = []
+    acquire = api.limiter.acquire
+    api.limiter.acquire = lambda: acquired.append(acquire())
+    with pytest.raises(requests.exceptions.HTTPError, match="429"):
+        api.get("circuits")
+    assert len(acquired) == 3 and server.hits == 4  # every 429 retry took a token
+    assert api.limiter.tokens <= 0  # and the server's "none left this minute" was heeded
+
+
+def test_non_json_body_is_a_request_error(server, monkeypatch):
+    server.faults = Faults(html_rate=1)
+    with pytest.raises(requests.exceptions.RequestException, match="not JSON"):
+        client(server.url).get("circuits")
+    monkeypatch.setattr(pitstop, "api", client(server.url))
+    assert pitstop.main(["circuit"]) == 1
+
+
+def test_injected_timeout(server):
+    server.faults = Faults(timeout_rate=1, hang=1)
+    with pytest.raises(requests.exceptions.RequestException, match="timed out"):
+        client(server.url, timeout=(1, 0.2)).get("circuits")
+
+
+def test_headless_results_end_to_end(server, monkeypatch, capsys):
+    monkeypatch.setattr(pitstop, "api", client(server.url))
+    assert pitstop.main(["results", "--season", "2023", "--race", "1", "--format", "json"]) == 0
+    rows = json.loads(capsys.readouterr().out)
+    assert [row["position"] for row in rows] == list(range(1, len(rows) + 1))
+
+
+def test_benchmark_splits_view_time_into_stages(server):
+    from bench_pitstop import VIEWS, STAGES, bench
+    result = bench(server.url, {"schedule": VIEWS["schedule"]}, repeat=1)["schedule"]
+    assert set(result["stages_ms"]) == set(STAGES)
+    assert result["stages_ms"]["http"] > 0 and result["stages_ms"]["timezone"] > 0
+    assert sum(result["stages_ms"].values()) <= result["median_ms"] * 1.05
+    assert result["peak_kib"] > 0
+
+
+def test_profile_trace(server, monkeypatch, tmp_path, capsys):
+    monkeypatch.setattr(pitstop.profiler, "enabled", False)
+    for name in ("calls", "views", "events"):
+        monkeypatch.setattr(pitstop.profiler, name, [])
+    monkeypatch.setattr(pitstop, "api", client(server.url))
+    trace = tmp_path / "trace.json"
+    assert pitstop.main(["--profile-trace", str(trace), "standings", "teams", "--season", "2023"]) == 0
+
+    view, = pitstop.profiler.views
+    assert view["name"] == "standings" and view["fetch"] > 0 and view["render"] > 0
+    assert abs(sum(view[stage] for stage in pitstop.Profiler.STAGES) - view["total"]) < 1e-6
+    call, = pitstop.profiler.calls
+    assert (call["endpoint"], call["source"], call["status"]) == ("rankings/teams", "network", 200)
+
+    events = json.loads(trace.read_text())["traceEvents"]
+    assert {event["cat"] for event in events} == {"view", "fetch", "render"}
+    assert "API calls" in capsys.readouterr().err
+
+
+def test_low_quota_prefers_stale_cache(server, tmp_path):
+    server.quota = 2
+    api = APIClient(server.url, {}, retries=0, cache=pitstop.ResponseCache(str(tmp_path / "cache.sqlite3")),
+                    limiter=pitstop.RateLimiter(reserve=0))
+    api.cache.put("circuits?", '{"response": ["stale"]}', -1)
+
+    api.get("teams")
+    assert not api.limiter.quota_low
+    api.get("races", season=2023)
+    assert api.limiter.quota_low
+    assert api.get("circuits") == {"response": ["stale"]}
+    assert server.hits == 2
+
+    api.cache.put("drivers?id=20", '{"response": ["stale"]}', -1)
+    api.limiter.daily_remaining = 100
+    assert api.get("drivers", id=20) == {"response": ["stale"]}  # refused by the API, served stale
+    assert api.limiter.daily_remaining == 0
+
+
+def test_concurrent_identical_requests_share_one_download(server):
+    server.faults = Faults(latency=0.3)
+    api = client(server.url)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda _: api.get("rankings/drivers", season=2023), range(4)))
+    assert server.hits == 1
+    assert all(result == results[0] for result in results) and results[0]["response"]
+
+
+def test_refresher_serves_stale_then_revalidates(server, tmp_path):
+    api = APIClient(server.url, {}, retries=0, cache=pitstop.ResponseCache(str(tmp_path / "cache.sqlite3")))
+    refresher = api.revalidator = pitstop.Refresher(api)
+    refresher.targets = lambda: [("rankings/teams", {"season": 2023})]
+    refresher.is_alive = lambda: True
+    api.cache.put("rankings/teams?season=2023", '{"response": ["last good copy"]}', -1)
+
+    assert api.get("rankings/teams", season=2023) == {"response": ["last good copy"]}
+    assert refresher.wake.is_set() and server.hits == 0
+
+    landed = []
+    refresher.listeners.append(lambda endpoint, params, data: landed.append(endpoint))
+    refresher.refresh_once()
+    assert landed == ["rankings/teams"] and server.hits == 1
+    assert api.get("rankings/teams", season=2023)["response"][0]["position"] == 1
+
+
+def test_refresher_outlives_errors_and_is_not_trusted_once_stopped(server, tmp_path):
+    api = APIClient(server.url, {}, retries=0, cache=pitstop.ResponseCache(str(tmp_path / "cache.sqlite3")))
+    refresher = api.revalidator = pitstop.Refresher(api, interval=0)
+    passes = []
+    def fail(only_expired=False):
+        passes.append(only_expired)
+        if len(passes) == 2:
+            refresher.stop()
+        raise pitstop.sqlite3.OperationalError("database is locked")
+    refresher.refresh_once = fail
+    refresher.start()
+    refresher.join(timeout=5)
+    assert passes == [True, False]  # the first error did not end the thread
+
+    api.cache.put("rankings/teams?season=2023", '{"response": ["last good copy"]}', -1)
+    assert api.get("rankings/teams", season=2023)["response"][0]["position"] == 1  # nobody would refresh it
+    assert server.hits == 1
+
+
+def test_weekend_rankings_are_fetched_concurrently(server, monkeypatch, capsys):
+    monkeypatch.setattr(pitstop, "api", client(server.url))
+    server.faults = Faults(latency=0.3)
+    race_id = pitstop.completed_races(2023)[0].id
+
+    started = time.perf_counter()
+    rankings = pitstop.weekend_rankings(race_id)
+    assert time.perf_counter() - started < 0.8  # three 0.3 s calls in parallel, not in series
+    assert set(rankings) == set(pitstop.RACE_RANKINGS) and all(rankings.values())
+
+    server.faults = Faults()
+    assert pitstop.main(["career", "20", "--format", "ndjson"]) == 0
+    seasons = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [row["season"] for row in seasons] == [2023, 2022]
+    assert seasons[0]["position"] is not None and seasons[1]["position"] is None  # no 2022 fixtures
+
+
+def test_load_history_fills_the_store_once(server, monkeypatch, tmp_path):
+    api = client(server.url)
+    api.store = pitstop.SnapshotStore(str(tmp_path / "store.sqlite3"))
+    monkeypatch.setattr(pitstop, "api", api)
+
+    assert pitstop.load_history([2022, 2023], workers=4) == (6, 0, 0)
+    assert pitstop.load_history([2022, 2023], workers=4) == (0, 6, 0)
+    assert server.hits == 6
+
+    history = pitstop.stored_history("rankings/teams", [2021, 2022, 2023])
+    assert sorted(history) == [2022, 2023] and len(history[2023]) == 10
+
+
+def test_results_table_queries(server, monkeypatch, tmp_path, capsys):
+    pytest.importorskip("numpy")
+    api = client(server.url)
+    api.store = pitstop.SnapshotStore(str(tmp_path / "store.sqlite3"))
+    monkeypatch.setattr(pitstop, "api", api)
+    monkeypatch.setattr(pitstop, "STATS_FILE", str(tmp_path / "results.npz"))
+    pitstop.load_history([2023])
+    pitstop.prefetch_season(2023, into_store=True)
+
+    assert pitstop.main(["stats", "build", "--season", "2023"]) == 0
+    assert "Indexed" in capsys.readouterr().out
+    results = pitstop.ResultsTable.load(pitstop.STATS_FILE)
+    races = len(pitstop.completed_races(2023))
+    assert len(results) == races * 20
+
+    finishes = {}
+    for entries in (api.get("rankings/races", race=race.id)["response"] for race in pitstop.completed_races(2023)):
+        for entry in entries:
+            finishes.setdefault(entry["driver"]["name"], []).append(entry["position"])
+    best = min(finishes, key=lambda name: sum(finishes[name]) / len(finishes[name]))
+    assert results.average_finish()[0] == [best, races, round(sum(finishes[best]) / races, 2)]
+    assert sum(count for _, _, count in results.fastest_lap_counts([2023])) == races
+
+    progression = results.points_progression(25, 2023)
+    assert [row[0] for row in progression] == list(range(1, races + 1))
+    assert progression[-1][3] == sum(row[2] for row in progression)
+
+    assert pitstop.main(["stats", "grid-delta", "--format", "ndjson"]) == 0
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert len(rows) == 20 and rows[0]["average_places_gained"] >= rows[-1]["average_places_gained"]
+
+    assert pitstop.main(["prefetch", "--season", "2023", "--rate", "0"]) == 0
+    assert not pitstop.os.path.exists(pitstop.STATS_FILE)  # new data: rebuilt on the next query
+    assert pitstop.main(["stats", "fastest-laps", "--format", "ndjson"]) == 0
+    assert pitstop.os.path.exists(pitstop.STATS_FILE)
+
+
+def test_search_index_finds_names(server, monkeypatch, tmp_path, capsys):
+    api = client(server.url)
+    api.store = pitstop.SnapshotStore(str(tmp_path / "store.sqlite3"))
+    monkeypatch.setattr(pitstop, "api", api)
+    monkeypatch.setattr(pitstop, "search_index", pitstop.SearchIndex(str(tmp_path / "search.sqlite3")))
+    pitstop.load_history([2023])
+
+    assert pitstop.main(["driver", "hamilton", "--format", "json"]) == 0
+    assert json.loads(capsys.readouterr().out)["name"] == "Lewis Hamilton"
+    hits = server.hits
+    assert [match.name for match in pitstop.lookup("driver", "Hülkenbreg")] == ["Nico Hulkenberg"]
+    assert [match.id for match in pitstop.lookup("driver", "20")] == [20]
+    assert server.hits == hits  # lookups never touch the API
+
+    assert pitstop.main(["team", "scuderia", "--format", "ndjson"]) == 0
+    assert len(capsys.readouterr().out.splitlines()) == 2  # Ferrari and AlphaTauri are listed, not picked
+    assert pitstop.main(["circuit", "monza", "--format", "json"]) == 0
+    assert json.loads(capsys.readouterr().out)["race_name"] == "Italian Grand Prix"
+
+    for endpoint, params in (("teams", {}), ("circuits", {}), ("rankings/drivers", {"season": pitstop.datetime.now().year})):
+        api.snapshot(endpoint, **params)
+    hits = server.hits
+    assert pitstop.main(["search", "--reindex", "ferrari"]) == 0
+    assert server.hits == hits  # everything is in the store now, so rebuilding downloads nothing
+    ferrari = pitstop.lookup("team", "ferrari")[0]
+    capsys.readouterr()
+    assert pitstop.main(["team", str(ferrari.id), "--format", "json"]) == 0  # digits are ids, as for drivers
+    assert json.loads(capsys.readouterr().out)["team"] == ferrari.name
+
+
+def test_watch_polls_fresh_rankings_and_backs_off(server, monkeypatch):
+    monkeypatch.setattr(pitstop, "api", client(server.url))
+    sleeps = []
+    monkeypatch.setattr(pitstop.time, "sleep", sleeps.append)
+    race = pitstop.completed_races(2023)[0]
+    hits = server.hits
+
+    board = pitstop.watch(race, min_interval=1, max_interval=8, polls=4)
+    assert server.hits - hits == 1 + 4 * len(pitstop.RACE_RANKINGS)  # the schedule, then no poll is served from cache
+    assert [seconds for seconds in sleeps if seconds] == [1, 2, 4]  # data came in once, then nothing changed
+    assert len(board.rows["races"]) == 20 and not any(board.highlighted.values())
+
+
+def test_closed_pipe_ends_quietly(server, tmp_path):
+    read_end, write_end = os.pipe()
+    os.close(read_end)  # like `| head -1` having already exited
+    env = dict(os.environ, API_URL=server.url, XDG_CACHE_HOME=str(tmp_path), XDG_DATA_HOME=str(tmp_path))
+    done = subprocess.run([sys.executable, pitstop.__file__, "schedule", "--season", "2023", "--format", "ndjson"],
+                          stdout=write_end, stderr=subprocess.PIPE, text=True, env=env, timeout=60)
+    os.close(write_end)
+    assert done.returncode == 1 and "Traceback" not in done.stderr
+
+
+def test_unknown_timezone_is_rejected_before_any_output(capsys):
+    with pytest.raises(SystemExit):
+        pitstop.main(["schedule", "--tz", "Mars/Olympus", "--format", "json"])
+    captured = capsys.readouterr()
+    assert captured.out == "" and "unknown timezone 'Mars/Olympus'" in captured.err
@@ -1,5 +1,11 @@
+import sys
+import json
+import subprocess
 import pytest
+import requests
+import pitstop
 from pitstop import conversion_to_localtime, fetch_races, fetch_timezones
+from pitstop import ResponseCache, cache_ttl, CACHE_FOREVER, CATALOG_TTL, CURRENT_TTL
 from datetime import datetime
 
 def test_conversion_to_localtime():
@@ -26,6 +32,259 @@ def test_conversion_to_localtime_tokyo():
     expected_local_time = "01-12-2023 17:00"
     assert conversion_to_localtime(utc_time, user_timezone) == expected_local_time
 
+def test_cache_ttl_policies():
+    current = datetime.now().year
+    assert cache_ttl("races", {"season": current - 1}) is CACHE_FOREVER
+    assert cache_ttl("rankings/drivers", {"season": current}) == CURRENT_TTL
+    assert cache_ttl("circuits", {}) == CATALOG_TTL
+    assert pitstop.race_ttl(current - 1) is CACHE_FOREVER  # a finished season's races never change
+    assert pitstop.race_ttl(current) == CURRENT_TTL
+
+def test_response_cache_expiry(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"))
+    cache.put("teams?", '{"response": []}', CACHE_FOREVER)
+    cache.put("races?season=2024", '{"response": []}', -1)
+    assert cache.get("teams?") == '{"response": []}'
+    assert cache.get("races?season=2024") is None
+
+def test_response_cache_evicts_least_recently_used(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"), max_bytes=10)
+    cache.put("a", "x" * 6, CACHE_FOREVER)
+    cache.put("b", "y" * 6, CACHE_FOREVER)
+    assert cache.get("a") is None
+    assert cache.get("b") == "y" * 6
+
+def test_fetch_timezones_is_built_once(monkeypatch):
+    calls = []
+    def fake_get(endpoint, **params):
+        calls.append(endpoint)
+        return {"response": ["Europe/London", "Europe/Paris", "Asia/Tokyo"]}
+    monkeypatch.setattr(pitstop.api, "get", fake_get)
+    pitstop.invalidate_timezones()
+
+    assert fetch_timezones() == {"Europe": ["London", "Paris"], "Asia": ["Tokyo"]}
+    fetch_timezones()
+    assert calls == ["timezone"]
+
+    pitstop.invalidate_timezones()
+    fetch_timezones()
+    assert calls == ["timezone", "timezone"]
+    pitstop.invalidate_timezones()
+
+def test_run_loops_without_recursion(monkeypatch):
+    visits = []
+    def fake_menu():
+        visits.append("menu")
+        return "exit" if len(visits) > 5000 else "menu"
+    monkeypatch.setattr(pitstop, "menu", fake_menu)
+    monkeypatch.setattr(pitstop, "fast_mode", True)
+    monkeypatch.setattr(pitstop, "clear_screen", lambda: None)
+
+    pitstop.run()
+    assert len(visits) == 5001
+
+def test_run_survives_non_numeric_input(monkeypatch):
+    answers = iter(["2", "abc", "4"])
+    monkeypatch.setattr(pitstop, "ask", lambda message: next(answers))
+    monkeypatch.setattr(pitstop, "fast_mode", True)
+    monkeypatch.setattr(pitstop, "clear_screen", lambda: None)
+
+    pitstop.run()
+    assert next(answers, None) is None  # back at the menu after the typo, then exited
+
+def test_headless_standings(monkeypatch, capsys):
+    def fake_get(endpoint, **params):
+        assert (endpoint, params) == ("rankings/teams", {"season": 2023})
+        return {"response": [{"position": 2, "team": {"name": "Mercedes"}, "points": 409},
+                             {"position": 1, "team": {"name": "Red Bull"}, "points": 860}]}
+    monkeypatch.setattr(pitstop.api, "get", fake_get)
+
+    assert pitstop.main(["standings", "teams", "--season", "2023"]) == 0
+    out = capsys.readouterr().out
+    assert out.index("Red Bull") < out.index("Mercedes")
+
+def test_headless_race_out_of_range(monkeypatch):
+    monkeypatch.setattr(pitstop.api, "get", lambda endpoint, **params: {"response": []})
+    assert pitstop.main(["results", "--season", "2023", "--race", "3"]) == 1
+
+def test_emit_streams_machine_formats(capsys):
+    columns = [("Position", "cyan"), ("Driver Name", "green"), ("Date/Time", "magenta")]
+    rows = [[1, "Max Verstappen", "18-05-2023 16:00"], [2, "Sergio Perez", None]]
+
+    pitstop.emit("Ranking", columns, iter(rows), "ndjson")
+    assert capsys.readouterr().out.splitlines() == [
+        '{"position": 1, "driver_name": "Max Verstappen", "date_time": "18-05-2023 16:00"}',
+        '{"position": 2, "driver_name": "Sergio Perez", "date_time": null}',
+    ]
+
+    pitstop.emit("Ranking", columns, iter(rows), "csv")
+    assert capsys.readouterr().out.splitlines() == [
+        "position,driver_name,date_time",
+        "1,Max Verstappen,18-05-2023 16:00",
+        "2,Sergio Perez,",
+    ]
+
+def test_prefetch_season_fetches_every_ranking(monkeypatch):
+    races = [{"id": race_id, "type": "Race", "date": f"2023-0{race_id}-01T13:00:00+00:00",
+              "competition": {"name": f"GP {race_id}"}, "circuit": {"name": "Circuit"}} for race_id in (1, 2, 3)]
+    requested = []
+    def fake_get(endpoint, ttl=None, **params):
+        if endpoint == "races":
+            return {"response": races}
+        requested.append((endpoint, params["race"], ttl))
+        return {"response": []}
+    monkeypatch.setattr(pitstop.api, "get", fake_get)
+    monkeypatch.setattr(pitstop.api, "cached", lambda endpoint, **params: params.get("race") == 3)
+
+    assert pitstop.prefetch_season(2023, workers=3) == (6, 3, 0)
+    assert sorted(requested) == sorted((f"rankings/{kind}", race_id, CACHE_FOREVER)
+                                       for kind in ("races", "fastestlaps", "startinggrid") for race_id in (1, 2))
+
+def test_split_races_partitions_once():
+    raw = [
+        {"id": 3, "type": "Race", "date": "2024-03-09T17:00:00+00:00", "competition": {"name": "Saudi GP"}, "circuit": {"name": "Jeddah"}},
+        {"id": 1, "type": "Race", "date": "2024-03-02T15:00:00+00:00", "competition": {"name": "Bahrain GP"}, "circuit": {"name": "Sakhir"}},
+        {"id": 2, "type": "1st Practice", "date": "2024-03-07T13:30:00Z", "competition": {"name": "Saudi GP"}, "circuit": {"name": "Jeddah"}},
+    ]
+    races = sorted(map(pitstop.parse_race, raw), key=lambda race: race.date)
+    upcoming, past = pitstop.split_races(races, now=datetime.fromisoformat("2024-03-08T00:00:00+00:00"))
+
+    assert [race.id for race in upcoming] == [3]
+    assert [race.id for race in past] == [2, 1]
+    assert pitstop.split_races(races, now=datetime.fromisoformat("2024-01-01T00:00:00+00:00"))[1] == []
+
+def test_convert_localtimes_matches_single_conversions():
+    utc_times = ["2023-05-18T15:00:00Z", "2024-01-20T02:30:00Z", "2023-12-01T08:00:00Z"]
+    for user_timezone in ("Europe/London", "America/New_York", "Australia/Sydney", "Asia/Tokyo"):
+        assert pitstop.convert_localtimes(utc_times, user_timezone) == [
+            conversion_to_localtime(utc_time, user_timezone) for utc_time in utc_times]
+    assert pitstop.convert_localtimes([pitstop.parse_utc(utc_times[0])], "Europe/London") == ["18-05-2023 16:00"]
+
+class FakeResponse:
+    def __init__(self, data, headers=None):
+        self.text = json.dumps(data)
+        self.content = self.text.encode()
+        self.headers = headers or {}
+        self.status_code = 200
+    def raise_for_status(self):
+        pass
+    def json(self):
+        return json.loads(self.text)
+
+def test_offline_reads_only_from_snapshot_store(tmp_path):
+    client = pitstop.APIClient("https://api.test", {}, store=pitstop.SnapshotStore(str(tmp_path / "store.sqlite3")))
+    urls = []
+    def fake_session_get(url, params=None, timeout=None):
+        urls.append(url)
+        return FakeResponse({"response": [{"name": "Monza"}]})
+    client.session.get = fake_session_get
+
+    client.offline = True
+    with pytest.raises(requests.exceptions.RequestException):
+        client.get("circuits")
+
+    client.offline = False
+    client.snapshot("circuits")
+    client.offline = True
+    assert client.get("circuits") == {"response": [{"name": "Monza"}]}
+    assert urls == ["https://api.test/circuits"]
+
+def test_error_envelopes_are_not_cached(tmp_path):
+    client = pitstop.APIClient("https://api.test", {}, cache=ResponseCache(str(tmp_path / "cache.sqlite3")),
+                               store=pitstop.SnapshotStore(str(tmp_path / "store.sqlite3")))
+    client.session.get = lambda url, params=None, timeout=None: FakeResponse(
+        {"errors": {"token": "Missing application key"}, "response": []})
+    with pytest.raises(requests.exceptions.RequestException, match="Missing application key"):
+        client.get("races", season=2020)
+    with pytest.raises(requests.exceptions.RequestException):
+        client.snapshot("races", season=2020)
+    assert not client.cached("races", season=2020) and not client.stored("races", season=2020)
+
+def test_rate_limiter_queues_past_the_burst(monkeypatch):
+    delays = []
+    monkeypatch.setattr(pitstop.time, "sleep", delays.append)
+    limiter = pitstop.RateLimiter(per_minute=60)
+    for _ in range(62):
+        limiter.acquire()
+    assert len(delays) == 2 and delays[0] == pytest.approx(1, abs=0.05) and delays[1] == pytest.approx(2, abs=0.05)
+
+def test_rate_limiter_follows_quota_headers():
+    limiter = pitstop.RateLimiter(per_minute=10, reserve=5)
+    limiter.update({"X-RateLimit-Remaining": "0", "x-ratelimit-requests-remaining": "50"})
+    assert limiter.tokens == 0 and not limiter.quota_low
+    limiter.update({"x-ratelimit-requests-remaining": "5"})
+    assert limiter.quota_low
+
+def test_race_weekend():
+    races = [pitstop.Race(1, "GP", "Circuit", "Race", datetime.fromisoformat("2024-03-02T15:00:00+00:00"))]
+    assert pitstop.race_weekend(races, now=datetime.fromisoformat("2024-03-01T12:00:00+00:00"))
+    assert pitstop.race_weekend(races, now=datetime.fromisoformat("2024-03-03T12:00:00+00:00"))
+    assert not pitstop.race_weekend(races, now=datetime.fromisoformat("2024-03-06T12:00:00+00:00"))
+    assert not pitstop.race_weekend(races, now=datetime.fromisoformat("2024-02-20T12:00:00+00:00"))
+
+def test_import_defers_heavy_dependencies():
+    heavy = ["requests", "rich.console", "pyfiglet", "pytz", "asyncio", "sqlite3", "numpy", "tqdm"]
+    check = ("import sys, pitstop; "
+             f"print([name for name in {heavy!r} if type(sys.modules.get(name)).__name__ == 'module'])")
+    loaded = subprocess.run([sys.executable, "-c", check], capture_output=True, text=True, check=True).stdout
+    assert loaded.strip() == "[]"
+
+def test_decode_response_projects_bulk_endpoints():
+    entry = {"position": 1, "time": "1:16:55.168", "grid": "7", "laps": 57, "pits": 3,
+             "driver": {"id": 20, "name": "Lewis Hamilton", "image": "20.png"}, "team": None}
+    body = json.dumps({"errors": [], "response": [entry]}).encode()
+    assert pitstop.decode_response("rankings/races", body)["response"] == [
+        {"position": 1, "time": "1:16:55.168", "grid": "7", "driver": {"id": 20, "name": "Lewis Hamilton"}, "team": None}]
+    assert pitstop.decode_response("drivers", body)["response"] == [entry]
+
+    del entry["team"], entry["driver"]["name"]  # missing keys stay missing, so views still see a KeyError
+    body = json.dumps({"errors": [], "response": [entry]}).encode()
+    projected = pitstop.decode_response("rankings/races", body)["response"]
+    assert projected == [{"position": 1, "time": "1:16:55.168", "grid": "7", "driver": {"id": 20}}]
+    with pytest.raises(KeyError):
+        list(pitstop.ranking_rows("races", projected))
+
+def test_pager_pulls_rows_one_page_at_a_time(monkeypatch, capsys):
+    pulled = []
+    def rows():
+        for index in range(1, 101):
+            pulled.append(index)
+            yield [index, "Monza" if index % 10 == 0 else "Silverstone"]
+    answers = iter(["", "n", "p", "/monza", "7"])
+    monkeypatch.setattr(pitstop, "ask", lambda message: next(answers))
+
+    pager = pitstop.Pager("Circuits", [("Index", "cyan"), ("Circuit", "green")], rows(), page_size=5)
+    assert pager.run() == "7"
+    assert len(pulled) == 60  # three pages, then one filtered page (and one row to spare) of Monza rows
+    assert [row[0] for row in pager.window()] == [10, 20, 30, 40, 50]
+    assert "matching 'monza'" in capsys.readouterr().out
+
+    answers = iter(["N", "P", "monza"])
+    assert pitstop.choose("Circuits", [("Index", "cyan"), ("Circuit", "green")], rows(), "> ") == 0
+
+def test_weekend_board_rebuilds_only_changed_rankings():
+    race = pitstop.Race(1, "GP", "Circuit", "Race", datetime.fromisoformat("2024-03-02T15:00:00+00:00"))
+    def entry(position, name):
+        return {"position": position, "time": None, "driver": {"name": name}, "team": {"name": "Team"}}
+    rankings = {kind: {"response": [entry(1, "Max Verstappen"), entry(2, "Lewis Hamilton")]} for kind in pitstop.RACE_RANKINGS}
+
+    board = pitstop.WeekendBoard(race)
+    assert board.update(rankings)
+    assert [row.style for row in board.tables["races"].rows] == [None, None]  # a first fill is not highlighted
+    grid = board.tables["startinggrid"]
+    rankings["races"] = {"response": [entry(1, "Max Verstappen"), entry(2, "Lando Norris")]}
+    rankings["fastestlaps"] = requests.exceptions.RequestException("timed out")
+    assert board.update(rankings)
+    assert board.highlighted["races"] == {1} and board.tables["startinggrid"] is grid
+    assert board.rows["fastestlaps"][1][1] == "Lewis Hamilton"
+    assert [row.style for row in board.tables["races"].rows] == [None, "bold yellow"]
+
+def test_poll_schedule_adapts():
+    schedule = pitstop.PollSchedule(min_interval=10, max_interval=300)
+    assert [schedule.next(False, session_running=False) for _ in range(6)] == [20, 40, 80, 160, 300, 300]
+    assert schedule.next(False, session_running=True) == 40
+    assert schedule.next(True, session_running=False) == 10
+
 
 if __name__ == "__main__":
     import pytest